@@ -1,13 +1,151 @@
-from sqlalchemy import create_engine
+import os
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./app.db"
+# 기본은 로컬 SQLite 파일, DATABASE_URL로 서버 DB(PostgreSQL 등)로 전환
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+# 읽기 전용 복제본 (미설정 시 SQLite 파일은 같은 파일의 읽기 전용 풀, 그 외에는 주 DB 사용)
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+
+# 비동기 라우트용 드라이버 (미설정 시 위 URL의 드라이버만 바꿔 사용)
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "mysql": "mysql+aiomysql"}
+
+# 커넥션 풀 크기 (SQLite 파일 DB와 서버 DB 공통)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# SQLite 연결마다 적용하는 PRAGMA
+# WAL: 읽기와 쓰기가 서로를 막지 않음, NORMAL: WAL에서 안전한 수준으로 fsync 감소
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # 음수 = KiB 단위 (64 MiB)
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
+}
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def to_async_url(url: str) -> str:
+    """동기 DB URL을 같은 DB의 비동기 드라이버 URL로 바꿉니다 (예: sqlite -> sqlite+aiosqlite)."""
+    parsed = make_url(url)
+    if parsed.get_dialect().is_async:
+        return url
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for '{parsed.get_backend_name()}', set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_db_engine(url: str, read_only: bool = False, **overrides: Any) -> Engine:
+    """
+    설정이 적용된 SQLAlchemy 엔진을 생성합니다.
+
+    - SQLite: 연결마다 SQLITE_PRAGMAS 적용 (read_only면 query_only 추가)
+    - 서버 DB: 풀 크기, pre-ping, recycle 적용
+
+    Args:
+        url: 데이터베이스 URL
+        read_only: 읽기 전용 연결 여부 (SQLite에서 쓰기 시도 시 에러)
+        **overrides: create_engine에 그대로 전달할 추가 옵션
+
+    Returns:
+        Engine: 생성된 엔진
+    """
+    db_engine = create_engine(url, **_engine_options(url), **overrides)
+    if is_sqlite(url):
+        _install_sqlite_pragmas(db_engine, read_only)
+    return db_engine
+
+
+def create_async_db_engine(url: str, read_only: bool = False, **overrides: Any) -> AsyncEngine:
+    """create_db_engine()의 비동기 버전 (같은 풀 설정과 PRAGMA 적용)."""
+    db_engine = create_async_engine(url, **_engine_options(url), **overrides)
+    if is_sqlite(url):
+        _install_sqlite_pragmas(db_engine.sync_engine, read_only)
+    return db_engine
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    options: Dict[str, Any] = {"pool_pre_ping": True}
+    if is_sqlite(url):
+        database = make_url(url).database
+        options["connect_args"] = {"check_same_thread": False}
+        if not database or database == ":memory:":
+            # 메모리 DB는 연결마다 별도 DB가 되므로 단일 연결 공유
+            options["poolclass"] = StaticPool
+        else:
+            options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    else:
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return options
+
+
+def _install_sqlite_pragmas(db_engine: Engine, read_only: bool) -> None:
+    pragmas = dict(SQLITE_PRAGMAS, **({"query_only": "ON"} if read_only else {}))
+    event.listen(db_engine, "connect", lambda dbapi_conn, _record: _apply_sqlite_pragmas(dbapi_conn, pragmas))
+
+
+def _apply_sqlite_pragmas(dbapi_conn: Any, pragmas: Dict[str, Any]) -> None:
+    cursor = dbapi_conn.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _separate_read_pool(url: str) -> bool:
+    # WAL에서는 같은 SQLite 파일의 별도 읽기 풀이 쓰기 트랜잭션을 기다리지 않음
+    database = make_url(url).database if is_sqlite(url) else None
+    return bool(database and database != ":memory:")
+
+
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
+if READ_DATABASE_URL:
+    read_engine = create_db_engine(READ_DATABASE_URL, read_only=True)
+elif _separate_read_pool(SQLALCHEMY_DATABASE_URL):
+    read_engine = create_db_engine(SQLALCHEMY_DATABASE_URL, read_only=True)
+else:
+    read_engine = engine
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# 비동기 엔진/세션 (async 라우트용, 연결은 첫 사용 시 생성)
+# expire_on_commit=False: 커밋 후 속성 접근이 암묵적 재조회(await 불가)를 일으키지 않도록
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(SQLALCHEMY_DATABASE_URL)
+ASYNC_READ_DATABASE_URL = os.getenv("ASYNC_READ_DATABASE_URL") or (
+    to_async_url(READ_DATABASE_URL) if READ_DATABASE_URL else None
+)
+
+async_engine = create_async_db_engine(ASYNC_DATABASE_URL)
+if ASYNC_READ_DATABASE_URL:
+    async_read_engine = create_async_db_engine(ASYNC_READ_DATABASE_URL, read_only=True)
+elif _separate_read_pool(ASYNC_DATABASE_URL):
+    async_read_engine = create_async_db_engine(ASYNC_DATABASE_URL, read_only=True)
+else:
+    async_read_engine = async_engine
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -18,3 +156,39 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """
+    읽기 전용 세션 (GET 라우트용).
+
+    READ_DATABASE_URL이 비동기 복제본이면 방금 쓴 데이터가 늦게 보일 수 있으므로
+    쓰기 직후 읽기 일관성이 필요한 경우 복제 지연이 없는 대상을 지정합니다.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """비동기 세션 (async 라우트용)."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """비동기 읽기 전용 세션 (get_read_db와 같은 일관성 주의사항 적용)."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+async def dispose_engines() -> None:
+    """풀에 남은 연결을 닫습니다 (앱 종료 시 호출)."""
+    engine.dispose()
+    if read_engine is not engine:
+        read_engine.dispose()
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
@@ -1,3 +1,17 @@
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import (
+    TokenPrincipal,
+    get_current_principal,
+    get_current_user,
+    get_current_user_async,
+    get_stream_principal,
+    invalidate_cached_user,
+)
 
-__all__ = ["get_current_user"]
+__all__ = [
+    "TokenPrincipal",
+    "get_current_principal",
+    "get_current_user",
+    "get_current_user_async",
+    "get_stream_principal",
+    "invalidate_cached_user",
+]
@@ -1,13 +1,58 @@
-from fastapi import Depends, HTTPException, status
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models.user import User
-from app.utils.security import decode_access_token
+from app.utils.cache import TTLCache
+from app.utils.security import decode_access_token, decode_access_token_async
 
 # OAuth2 스키마 (토큰을 Authorization 헤더에서 추출)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+# 헤더가 없어도 에러를 내지 않는 스키마 (쿼리 파라미터 토큰을 허용하는 스트림용)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+
+# 인증된 사용자 캐시 (user_id -> 세션에서 분리된 User 스냅샷)
+# 사용자 정보 변경 시 invalidate_cached_user()로 즉시 무효화
+USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "30"))
+_user_cache = TTLCache(maxsize=int(os.getenv("AUTH_USER_CACHE_SIZE", "1024")))
+
+
+@dataclass(frozen=True)
+class TokenPrincipal:
+    """JWT 클레임만으로 구성한 인증 주체 (DB 조회 없음)"""
+    id: int
+    claims: dict = field(default_factory=dict, compare=False)
+
+
+def _user_id_from_claims(payload: dict) -> int:
+    # 토큰에서 user_id 추출
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return int(user_id)
+
+
+def _detached_snapshot(user: User) -> User:
+    """컬럼 값만 복사한 분리(detached) 상태의 User를 만듭니다."""
+    snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """사용자 정보가 바뀌었을 때 캐시된 사용자를 제거합니다."""
+    _user_cache.invalidate(user_id)
 
 
 def get_current_user(
@@ -17,6 +62,9 @@ def get_current_user(
     """
     JWT 토큰에서 현재 사용자를 가져옵니다.
 
+    최근 조회한 사용자는 짧은 TTL 동안 캐시되며, 캐시 적중 시 DB 쿼리 없이
+    현재 세션에 연결(merge)한 객체를 반환합니다.
+
     Args:
         token: Authorization 헤더에서 추출한 Bearer 토큰
         db: 데이터베이스 세션
@@ -29,18 +77,44 @@ def get_current_user(
     """
     # 토큰 디코딩 (decode_access_token에서 JWTError 처리)
     payload = decode_access_token(token)
+    user_id = _user_id_from_claims(payload)
 
-    # 토큰에서 user_id 추출
-    user_id: str = payload.get("sub")
-    if user_id is None:
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        # load=False: SELECT 없이 스냅샷 상태로 세션에 연결
+        return db.merge(cached, load=False)
+
+    # DB에서 사용자 조회
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+            detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # DB에서 사용자 조회
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    _user_cache.set(user_id, _detached_snapshot(user), USER_CACHE_TTL)
+    return user
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    get_current_user()의 비동기 버전 (async 라우트용, AsyncSession에 연결된 User 반환).
+
+    Raises:
+        HTTPException: 토큰이 유효하지 않거나 사용자를 찾을 수 없는 경우 401 에러
+    """
+    payload = await decode_access_token_async(token)
+    user_id = _user_id_from_claims(payload)
+
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        return await db.merge(cached, load=False)
+
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,4 +122,42 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    _user_cache.set(user_id, _detached_snapshot(user), USER_CACHE_TTL)
     return user
+
+
+def get_current_principal(token: str = Depends(oauth2_scheme)) -> TokenPrincipal:
+    """
+    JWT 서명과 클레임만으로 인증합니다 (DB 세션을 열지 않음).
+
+    사용자 삭제/비활성화는 토큰 만료 전까지 반영되지 않으므로 공개 시세처럼
+    사용자 데이터에 접근하지 않는 엔드포인트에만 사용합니다.
+
+    Raises:
+        HTTPException: 토큰이 유효하지 않은 경우 401 에러
+    """
+    payload = decode_access_token(token)
+    return TokenPrincipal(id=_user_id_from_claims(payload), claims=payload)
+
+
+def get_stream_principal(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(default=None, description="Bearer token for clients that cannot set headers (EventSource)"),
+) -> TokenPrincipal:
+    """
+    푸시 스트림용 인증: Authorization 헤더 또는 access_token 쿼리 파라미터의 JWT를 검증합니다.
+
+    브라우저 EventSource는 헤더를 설정할 수 없어 쿼리 파라미터를 허용합니다.
+    연결이 오래 유지되므로 DB 세션을 열지 않는 클레임 기반 인증을 사용합니다.
+
+    Raises:
+        HTTPException: 토큰이 없거나 유효하지 않은 경우 401 에러
+    """
+    token = token or access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return get_current_principal(token)
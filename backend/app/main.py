@@ -1,13 +1,64 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-from app.database import engine, Base
+from app.database import engine, Base, dispose_engines
+from app.migrations import run_migrations
 from app.routers import examples, auth, widgets, gold
+from app.utils.http_client import open_upstream_client, close_upstream_client
+from app.utils.security import start_revocation_sync, stop_revocation_sync
+
+try:
+    # 선택 의존성: 설치되어 있으면 brotli(br), 아니면 gzip으로 응답 압축
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
 
-# 데이터베이스 테이블 생성
+# 데이터베이스 테이블 생성 및 기존 테이블 마이그레이션
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+# 압축 미들웨어가 버퍼링하지 않도록 이벤트 스트림 요청은 압축 협상에서 제외
+STREAM_PATHS = {"/api/gold/stream"}
+
+
+class StreamCompressionBypass:
+    """Accept-Encoding을 제거해 스트림 응답이 이벤트 단위로 바로 전송되게 합니다."""
+
+    def __init__(self, app, paths):
+        self.app = app
+        self.paths = set(paths)
 
-app = FastAPI(title="Module 5 API", version="1.0.0")
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.paths:
+            scope = dict(scope)
+            scope["headers"] = [(k, v) for k, v in scope["headers"] if k != b"accept-encoding"]
+        await self.app(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 디스크에 저장된 금 시세로 워밍업 후 백그라운드 갱신 시작 (요청은 캐시만 읽음)
+    await asyncio.to_thread(gold.warm_series_from_disk)
+    # 외부 API용 공유 HTTP 클라이언트 (커넥션 풀, 동시성 제한, 서킷 브레이커)
+    await open_upstream_client()
+    gold.start_background_refresh()
+    # 다른 워커가 폐기한 토큰을 주기적으로 읽어 옴 (토큰 검증 경로는 DB를 열지 않음)
+    start_revocation_sync()
+    yield
+    await stop_revocation_sync()
+    await gold.stop_background_refresh()
+    await close_upstream_client()
+    await asyncio.to_thread(gold.close_shared_cache)
+    # write-behind 버퍼에 남은 위젯 레이아웃 저장
+    await asyncio.to_thread(widgets.flush_pending_layouts)
+    await dispose_engines()
+
+
+app = FastAPI(title="Module 5 API", version="1.0.0", lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -18,6 +69,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (Accept-Encoding 협상, 작은 응답은 압축하지 않음)
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=1000, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(StreamCompressionBypass, paths=STREAM_PATHS)
+
 # 라우터 등록
 app.include_router(examples.router)
 app.include_router(auth.router)
@@ -0,0 +1,50 @@
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Text -> JSON로 바뀐 위젯 컬럼
+WIDGET_JSON_COLUMNS = ("config", "layout")
+
+
+def run_migrations(db_engine: Engine) -> None:
+    """
+    create_all()이 처리하지 못하는 기존 테이블 변경을 적용합니다 (여러 번 실행해도 안전).
+
+    Args:
+        db_engine: 동기 엔진
+    """
+    migrate_widget_json_columns(db_engine)
+
+
+def migrate_widget_json_columns(db_engine: Engine) -> None:
+    """
+    widgets.config/layout을 JSON 문자열(Text)에서 네이티브 JSON 컬럼으로 전환합니다.
+
+    - PostgreSQL: text 컬럼을 JSONB로 변환 (기존 JSON 문자열을 그대로 파싱)
+    - SQLite: JSON은 텍스트로 저장되므로 스키마 변경 없이 기존 값을 그대로 읽음.
+      JSON으로 읽을 수 없는 행만 경고로 남김
+    """
+    inspector = inspect(db_engine)
+    if not inspector.has_table("widgets"):
+        return
+
+    dialect = db_engine.dialect.name
+    with db_engine.begin() as conn:
+        if dialect == "postgresql":
+            column_types = {c["name"]: str(c["type"]).upper() for c in inspector.get_columns("widgets")}
+            for column in WIDGET_JSON_COLUMNS:
+                if column_types.get(column) == "TEXT":
+                    logger.info("Converting widgets.%s to JSONB", column)
+                    conn.execute(text(
+                        f"ALTER TABLE widgets ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"
+                    ))
+        elif dialect == "sqlite":
+            for column in WIDGET_JSON_COLUMNS:
+                invalid = conn.execute(text(
+                    f"SELECT id FROM widgets WHERE {column} IS NOT NULL AND json_valid({column}) = 0"
+                )).scalars().all()
+                if invalid:
+                    logger.warning("widgets.%s holds invalid JSON for ids %s", column, invalid)
@@ -1,5 +1,7 @@
 from app.models.example import Example
+from app.models.price_bar import PriceBar
+from app.models.revoked_token import RevokedToken
 from app.models.user import User
 from app.models.widget import Widget
 
-__all__ = ["Example", "User", "Widget"]
+__all__ = ["Example", "PriceBar", "RevokedToken", "User", "Widget"]
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Date, Float, BigInteger, DateTime
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class PriceBar(Base):
+    __tablename__ = "price_bars"
+
+    symbol = Column(String(20), primary_key=True)
+    date = Column(Date, primary_key=True)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, Float
+
+from app.database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # 증가하는 id로 각 워커가 마지막으로 읽은 이후의 폐기만 가져옴
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    token_hash = Column(String(64), unique=True, nullable=False)  # 토큰 SHA-256
+    expires_at = Column(Float, nullable=False, index=True)  # 토큰 exp (Unix 초), 이후 행 삭제 가능
@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import JSON, Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
 
+# 네이티브 JSON 컬럼 (SQLite: JSON1 텍스트, PostgreSQL: JSONB)
+# none_as_null: None은 JSON 'null'이 아닌 SQL NULL로 저장
+JSONType = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
 
 class Widget(Base):
     __tablename__ = "widgets"
@@ -12,8 +17,8 @@ class Widget(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     type = Column(String(50), default="default", nullable=False)
-    config = Column(Text, nullable=True)  # JSON string
-    layout = Column(Text, nullable=False)  # JSON string
+    config = Column(JSONType, nullable=True)  # dict
+    layout = Column(JSONType, nullable=False)  # {x, y, w, h, i}
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -1,20 +1,37 @@
+import asyncio
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, Token
-from app.utils.security import hash_password, verify_password, create_access_token
-from app.dependencies.auth import get_current_user
+from app.utils.security import (
+    create_access_token,
+    hash_password_async,
+    password_needs_rehash,
+    revoke_token,
+    token_cache_stats,
+    verify_password_async,
+)
+from app.dependencies.auth import (
+    TokenPrincipal,
+    get_current_principal,
+    get_current_user_async,
+    invalidate_cached_user,
+    oauth2_scheme,
+)
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     새로운 사용자를 등록합니다.
 
@@ -24,7 +41,9 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     - 사용자 생성
     """
     # 사용자명 중복 확인
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
+    existing_user = (await db.execute(
+        select(User.id).where(User.username == user_data.username)
+    )).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -32,15 +51,17 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
     # 이메일 중복 확인
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_email = (await db.execute(
+        select(User.id).where(User.email == user_data.email)
+    )).first()
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Email '{user_data.email}' is already registered"
         )
 
-    # 비밀번호 해싱
-    hashed_password = hash_password(user_data.password)
+    # 비밀번호 해싱 (bcrypt 전용 스레드 풀, 포화 시 429)
+    hashed_password = await hash_password_async(user_data.password)
 
     # 새 사용자 생성
     new_user = User(
@@ -51,18 +72,19 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
 
     try:
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        # id와 서버 기본값 로드
+        await db.refresh(new_user)
         return new_user
     except IntegrityError:
         # Race condition으로 인한 중복 발생 시
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username or email is already registered (race condition)"
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to register user: {str(e)}"
@@ -70,41 +92,72 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     사용자 로그인 및 JWT 토큰 발급.
 
     - OAuth2PasswordRequestForm의 username 필드에 이메일을 입력받습니다.
     - 이메일과 비밀번호를 검증합니다.
+    - bcrypt 비용 설정이 바뀐 경우 비밀번호를 새 비용으로 재해싱합니다.
     - 성공 시 JWT 액세스 토큰을 반환합니다.
     - 실패 시 401 Unauthorized 에러를 반환합니다.
     """
     # 이메일로 사용자 조회 (username 필드에 이메일이 들어옴)
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = (await db.execute(
+        select(User).where(User.email == form_data.username)
+    )).scalar_one_or_none()
 
     # 사용자가 없거나 비밀번호가 틀린 경우 (동일한 에러 메시지 사용 - 보안 모범 사례)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # bcrypt 비용 설정이 바뀌었으면 로그인 시 새 비용으로 재해싱
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await hash_password_async(form_data.password)
+
     # JWT 토큰 생성 (user.id를 subject로 저장)
     access_token = create_access_token(data={"sub": str(user.id)})
 
     # last_login 타임스탬프 업데이트
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    invalidate_cached_user(user.id)
 
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    current_user: TokenPrincipal = Depends(get_current_principal)
+):
+    """
+    현재 액세스 토큰을 폐기합니다.
+
+    폐기된 토큰은 만료될 때까지 모든 워커에서 401로 거부됩니다
+    (다른 워커에는 REVOCATION_SYNC_INTERVAL초 이내에 반영).
+    """
+    await asyncio.to_thread(revoke_token, token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/token-cache/stats")
+def get_token_cache_stats(current_user: TokenPrincipal = Depends(get_current_principal)) -> Dict[str, Any]:
+    """
+    토큰 검증 캐시 통계(적중률 등)와 폐기 목록 크기를 반환합니다.
+    """
+    return token_cache_stats()
+
+
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user_async)):
     """
     현재 로그인한 사용자의 정보를 반환합니다.
 
@@ -115,19 +168,18 @@ def get_me(current_user: User = Depends(get_current_user)):
 
 
 @router.put("/me", response_model=UserResponse)
-def update_me(
+async def update_me(
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     현재 로그인한 사용자의 정보를 수정합니다.
     """
     if user_data.username is not None:
-        existing = db.query(User).filter(
-            User.username == user_data.username,
-            User.id != current_user.id
-        ).first()
+        existing = (await db.execute(
+            select(User.id).where(User.username == user_data.username, User.id != current_user.id)
+        )).first()
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -136,10 +188,9 @@ def update_me(
         current_user.username = user_data.username
 
     if user_data.email is not None:
-        existing = db.query(User).filter(
-            User.email == user_data.email,
-            User.id != current_user.id
-        ).first()
+        existing = (await db.execute(
+            select(User.id).where(User.email == user_data.email, User.id != current_user.id)
+        )).first()
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -154,20 +205,23 @@ def update_me(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="현재 비밀번호를 입력해주세요"
             )
-        if not verify_password(user_data.current_password, current_user.hashed_password):
+        if not await verify_password_async(user_data.current_password, current_user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="현재 비밀번호가 올바르지 않습니다"
             )
-        current_user.hashed_password = hash_password(user_data.new_password)
+        current_user.hashed_password = await hash_password_async(user_data.new_password)
 
     try:
-        db.commit()
-        db.refresh(current_user)
+        await db.commit()
+        await db.refresh(current_user)
         return current_user
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"사용자 정보 수정 실패: {str(e)}"
         )
+    finally:
+        # 인증 캐시에 남은 이전 사용자 정보 제거
+        invalidate_cached_user(current_user.id)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import Example
 from app.schemas import ExampleCreate, ExampleResponse
 
@@ -9,12 +9,12 @@ router = APIRouter(prefix="/api/examples", tags=["examples"])
 
 
 @router.get("/", response_model=list[ExampleResponse])
-def get_examples(db: Session = Depends(get_db)):
+def get_examples(db: Session = Depends(get_read_db)):
     return db.query(Example).all()
 
 
 @router.get("/{example_id}", response_model=ExampleResponse)
-def get_example(example_id: int, db: Session = Depends(get_db)):
+def get_example(example_id: int, db: Session = Depends(get_read_db)):
     example = db.query(Example).filter(Example.id == example_id).first()
     if not example:
         raise HTTPException(status_code=404, detail="Example not found")
@@ -1,34 +1,109 @@
+import asyncio
+import inspect
+import json
+import logging
 import os
-import time
 import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
+import numpy as np
+import pandas as pd
 import yfinance as yf
-import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
-from app.dependencies.auth import get_current_user
+from app.database import SessionLocal
+from app.dependencies.auth import TokenPrincipal, get_current_principal, get_current_user, get_stream_principal
 from app.models.user import User
+from app.schemas.gold import GoldBatchItem, GoldBatchRequest
+from app.utils.backtest import backtest_signals
+from app.utils.bar_store import SqlBarStore
+from app.utils.cache import TTLCache
+from app.utils.cache_backends import SharedCache, create_cache_backend
+from app.utils.downsample import choose_ohlc_bucket, lttb, lttb_size, ohlc_bucket_sizes, resample_ohlc
+from app.utils.http_cache import RenderedPayloads, cache_headers, make_etag, not_modified, render_json
+from app.utils.http_client import get_upstream_client
+from app.utils.indicators import DEFAULT_RULES, IndicatorEngine, RuleSet, indicator_columns
+from app.utils.materialize import Materializer
+from app.utils.pubsub import Broadcaster
+from app.utils.scheduler import BackgroundScheduler
+from app.utils.serialization import BAR_FIELDS, bars_to_records, columns_to_records, records_to_columnar
+from app.utils.timeseries import OHLCV_COLUMNS, Fetcher, SeriesStore
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/gold", tags=["gold"])
 
-# In-memory cache system
-_cache: Dict[str, Tuple[float, Any]] = {}
-
-
-def _get_cached(key: str, ttl: int) -> Optional[Any]:
-    """Get data from cache if not expired."""
-    if key in _cache:
-        ts, data = _cache[key]
-        if time.time() - ts < ttl:
-            return data
-    return None
-
-
-def _set_cache(key: str, data: Any) -> None:
-    """Store data in cache with current timestamp."""
-    _cache[key] = (time.time(), data)
+# Bounded in-memory cache: LRU eviction, single-flight loads and
+# stale-while-revalidate (expired data is served while one refresh runs)
+_cache = TTLCache(maxsize=256)
+
+# Optional host-wide cache shared by all workers (GOLD_CACHE_URL, e.g.
+# sqlite:///./gold_cache.db or redis://localhost:6379/0): upstream downloads and
+# dataset payloads are loaded by one worker and read by the others.
+# Unset = every worker loads on its own.
+GOLD_CACHE_URL = os.environ.get("GOLD_CACHE_URL")
+_shared = SharedCache(create_cache_backend(GOLD_CACHE_URL)) if GOLD_CACHE_URL else None
+
+# Serialized bodies + strong ETags of cached payloads (computed once per new payload);
+# unchanged data is answered with 304 and Cache-Control max-age = dataset TTL
+_rendered = RenderedPayloads(maxsize=256)
+
+# Cache TTLs in seconds: (fresh, extra stale window)
+INTL_TTL = (300, 600)
+KRX_TTL = (3600, 3600)
+PREMIUM_TTL = (300, 600)
+RECOMMENDATION_TTL = (300, 600)
+
+PERIODS = ("1d", "1w", "1m", "1y", "3y", "5y")
+# Datasets that do not depend on the period: the recommendation reads indicators
+# over the whole stored GC=F history, so every period shares one "all" entry
+PERIODLESS_DATASETS = ("gold_rec",)
+ALL_PERIODS = "all"
+
+TROY_OUNCE_GRAMS = 31.1035
+# KRX period read for each premium period (short periods use a wider KRX window)
+_PREMIUM_KRX_PERIOD = {"1d": "1m", "1w": "1m", "1m": "1m", "1y": "1y", "3y": "3y", "5y": "5y"}
+PREMIUM_FIELDS = ("date", "premium_pct", "krx_price", "intl_price_krw")
+BACKTEST_FIELDS = ("date", "signal", "close", "premium_pct", "hit", "equity", "benchmark")
+
+# Calendar days of GC=F history loaded before a backtest window to warm up the indicators
+BACKTEST_WARMUP_DAYS = 60
+
+# Decimal places of OHLC prices per dataset
+_BAR_DECIMALS = {"intl_gold": 2, "krx_gold": 0}
+
+# Background refresh keeps every period warm so requests only read the cache.
+# Each dataset is re-fetched at this fraction of its TTL.
+REFRESH_ENABLED = os.environ.get("GOLD_BACKGROUND_REFRESH", "true").lower() not in ("0", "false", "no")
+REFRESH_TTL_RATIO = 0.8
+
+_scheduler = BackgroundScheduler()
+
+# Gold data is not user-specific: with GOLD_AUTH_CLAIMS_ONLY the endpoints
+# authorize from the JWT claims alone and never open a DB session.
+GOLD_AUTH_CLAIMS_ONLY = os.environ.get("GOLD_AUTH_CLAIMS_ONLY", "false").lower() in ("1", "true", "yes")
+_authorize = get_current_principal if GOLD_AUTH_CLAIMS_ONLY else get_current_user
+Principal = Union[User, TokenPrincipal]
+
+# Push stream: public channel name -> dataset. Background refreshes publish what
+# changed to subscribers of (channel, period); a comment line keeps idle
+# connections open through proxies.
+STREAM_CHANNELS = {
+    "international": "intl_gold",
+    "krx": "krx_gold",
+    "premium": "gold_premium",
+    "recommendation": "gold_rec",
+}
+_DATASET_CHANNELS = {name: channel for channel, name in STREAM_CHANNELS.items()}
+STREAM_HEARTBEAT = float(os.environ.get("GOLD_STREAM_HEARTBEAT", "15"))
+_broadcaster = Broadcaster(
+    queue_size=32,
+    max_subscribers=int(os.environ.get("GOLD_STREAM_MAX_SUBSCRIBERS", "1000")),
+)
 
 
 def _period_to_days(period: str) -> int:
@@ -44,41 +119,258 @@ def _period_to_days(period: str) -> int:
     return period_map.get(period, 1)
 
 
-def _get_date_range(period: str) -> Tuple[datetime, datetime]:
-    """Get start and end dates for the given period."""
-    end_date = datetime.now()
-    days = _period_to_days(period)
-    start_date = end_date - timedelta(days=days)
-    return start_date, end_date
+def _fetch_yahoo_bars(symbol: str) -> Fetcher:
+    """Build a SeriesStore fetcher that downloads daily bars from Yahoo Finance."""
+    def fetch(start: datetime, end: datetime) -> pd.DataFrame:
+        # yfinance end는 exclusive
+        ticker = yf.Ticker(symbol)
+        return ticker.history(start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"))
+    return fetch
+
+
+async def _fetch_krx_bars(start: datetime, end: datetime) -> pd.DataFrame:
+    """Download KRX gold bars from data.go.kr, following pages until every row is read."""
+    service_key = os.environ.get("DATA_GO_KR_API_KEY", "62c4b90a631d34e8d130b6589358d104193ade5e747a4fe0277205dae426a605")
+    url = "https://apis.data.go.kr/1160100/service/GetGeneralProductInfoService/getGoldPriceInfo"
+    params = {
+        "serviceKey": service_key,
+        "resultType": "json",
+        "beginBasDt": start.strftime("%Y%m%d"),
+        "endBasDt": end.strftime("%Y%m%d"),
+        "numOfRows": 1000,
+        "pageNo": 1
+    }
+
+    # Shared pooled client (keep-alive, concurrency limit, circuit breaker)
+    client = get_upstream_client()
+    items: List[Dict[str, Any]] = []
+    while True:
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        body = response.json()["response"]["body"]
+        page_items = (body.get("items") or {}).get("item", [])
+        items.extend(page_items)
+        if not page_items or len(items) >= int(body.get("totalCount", 0)):
+            break
+        params["pageNo"] += 1
+
+    return _parse_krx_items(items)
+
+
+# data.go.kr field -> OHLCV column
+_KRX_FIELDS = {"mkp": "Open", "hipr": "High", "lopr": "Low", "clpr": "Close", "trqu": "Volume"}
+
+
+def _parse_krx_items(items: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Convert data.go.kr items into an OHLCV frame indexed by date, column by column."""
+    raw = pd.DataFrame.from_records(items, columns=["basDt"] + list(_KRX_FIELDS))
+    frame = raw[list(_KRX_FIELDS)].apply(pd.to_numeric, errors="coerce").fillna(0).astype("int64")
+    frame.columns = OHLCV_COLUMNS
+    frame.index = pd.to_datetime(raw["basDt"], format="%Y%m%d", errors="coerce")
+    # data.go.kr API는 최신순(내림차순)으로 반환 - 정렬은 SeriesStore에서 처리
+    return frame[frame.index.notna()]
+
+
+# Bounded pool for blocking yfinance downloads, separate from the request threadpool
+_fetch_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("GOLD_FETCH_WORKERS", "4")), thread_name_prefix="gold-fetch"
+)
+
+# 5y of daily bars per symbol, downloaded once and sliced for every period.
+# Bars are persisted in app.db so restarts only fetch what is new. Concurrent
+# reads of the same symbol share one in-flight download.
+_series = SeriesStore(
+    history_days=_period_to_days("5y"),
+    persistence=SqlBarStore(SessionLocal),
+    executor=_fetch_executor,
+)
+
+
+def _shared_fetcher(symbol: str, fetcher: Fetcher, max_age: float) -> Fetcher:
+    """
+    Share a fetcher's downloads between workers through the host-wide cache.
+
+    Workers refreshing the same date window within `max_age` seconds reuse one
+    download; without a shared cache the fetcher is returned unchanged.
+    """
+    if _shared is None:
+        return fetcher
+
+    async def fetch(start: datetime, end: datetime) -> pd.DataFrame:
+        async def download() -> pd.DataFrame:
+            if inspect.iscoroutinefunction(fetcher):
+                return await fetcher(start, end)
+            return await asyncio.get_running_loop().run_in_executor(_fetch_executor, fetcher, start, end)
+        key = f"gold:bars:{symbol}:{start:%Y%m%d}:{end:%Y%m%d}"
+        return await _shared.aget_or_load(key, max_age, download)
+    return fetch
+
+
+def _register_series(symbol: str, fetcher: Fetcher, max_age: float) -> None:
+    _series.register(symbol, _shared_fetcher(symbol, fetcher, max_age), max_age=max_age)
+
+
+_register_series("GC=F", _fetch_yahoo_bars("GC=F"), max_age=INTL_TTL[0] * 0.5)
+_register_series("KRW=X", _fetch_yahoo_bars("KRW=X"), max_age=INTL_TTL[0] * 0.5)
+_register_series("KRX", _fetch_krx_bars, max_age=KRX_TTL[0] * 0.5)
+
+# Streaming SMA/EMA/RSI/Bollinger/ATR state for GC=F, advanced only by new bars
+# as the series store merges them. The recommendation rule set is configurable
+# through a JSON file ({"buy": [[left, op, right], ...], "sell": [...]}).
+_gold_indicators = IndicatorEngine()
+_series.add_listener("GC=F", _gold_indicators.sync)
+# Names a rule may compare: every indicator output plus the kimchi premium
+RULE_OPERANDS = frozenset(_gold_indicators.snapshot()) | {"premium_pct"}
+GOLD_RULES_FILE = os.environ.get("GOLD_RULES_FILE")
+GOLD_RULES = RuleSet.from_file(GOLD_RULES_FILE, RULE_OPERANDS) if GOLD_RULES_FILE else DEFAULT_RULES
+
+
+async def _cached(name: str, period: str) -> Dict[str, Any]:
+    """
+    Read a dataset: the snapshot materialized by the background refresh if there
+    is one that was current within the dataset's TTL plus stale window,
+    otherwise through the shared cache, loading it once on a miss.
+    """
+    if name in PERIODLESS_DATASETS:
+        period = ALL_PERIODS
+    key = f"{name}_{period}"
+    loader, (ttl, stale_ttl) = _DATASETS[name]
+    # Snapshots the refresh job keeps failing to recompute (or stopped updating) age out here
+    snapshot = _materialized.get(key, max_age=ttl + stale_ttl)
+    if snapshot is not None:
+        return snapshot
+    return await _cache.aget_or_set(key, ttl, _shared_load(key, ttl, partial(loader, period)), stale_ttl=stale_ttl)
+
+
+async def _derived(name: str, key: str, build: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Cache a value derived from dataset `name` under `key`, with the dataset's TTLs."""
+    _, (ttl, stale_ttl) = _DATASETS[name]
+    return await _cache.aget_or_set(key, ttl, _shared_load(key, ttl, build), stale_ttl=stale_ttl)
+
+
+def _shared_load(key: str, ttl: float, loader: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+    """
+    Route a local cache miss through the host-wide cache (if configured).
+
+    A value another worker stored is kept locally only for the time it has
+    left in the shared cache, so data is never older than `ttl` in total.
+    """
+    if _shared is None:
+        return loader
+    return partial(_shared.aget_or_load_expiring, f"gold:{key}", ttl, loader)
+
+
+async def _cached_bars(
+    name: str, period: str, fmt: str, max_points: Optional[int] = None
+) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    Read an OHLC dataset, optionally aggregated to at most `max_points` candles,
+    in the requested format ("rows" or "columnar").
+
+    `max_points` is first resolved to a candle size, so results are cached (and
+    rendered) per candle size, not per requested number.
+
+    Returns:
+        (candle interval or None without max_points, payload)
+    """
+    result = await _cached(name, period)
+    key, interval = f"{name}_{period}", None
+    if max_points:
+        freq, interval = _ohlc_bucket(name, period, result, max_points)
+        key = f"{key}_{interval}"
+        result = await _derived(name, key, partial(_resampled_bars, name, result, freq, interval))
+    if fmt != "columnar":
+        return interval, result
+
+    async def build() -> Dict[str, Any]:
+        return _to_columnar(result)
+    return interval, await _derived(name, f"{key}_columnar", build)
+
+
+# (dataset, period) -> (payload, ohlc_bucket_sizes of its bars) for the payload last seen,
+# so resolving max_points to a candle size does not rescan the bars on every request
+_bucket_sizes: Dict[Tuple[str, str], Tuple[Dict[str, Any], Tuple[Tuple[str, str, int], ...]]] = {}
+
+
+def _ohlc_bucket(name: str, period: str, result: Dict[str, Any], max_points: int) -> Tuple[str, str]:
+    """(pandas period alias, interval label) of the finest candle size with at most max_points candles."""
+    memo = _bucket_sizes.get((name, period))
+    if memo is None or memo[0] is not result:
+        index = pd.DatetimeIndex(pd.to_datetime([bar["date"] for bar in result["data"]]))
+        memo = _bucket_sizes[(name, period)] = (result, ohlc_bucket_sizes(index))
+    return choose_ohlc_bucket(memo[1], max_points)
+
+
+async def _resampled_bars(name: str, result: Dict[str, Any], freq: str, interval: str) -> Dict[str, Any]:
+    """Aggregate the daily bars of a dataset payload into `freq` candles (daily bars are kept as is)."""
+    if not freq:
+        return {**result, "interval": interval}
+    candles = resample_ohlc(_records_to_bars(result["data"]), freq)
+    return {**result, "interval": interval, "data": bars_to_records(candles, decimals=_BAR_DECIMALS[name])}
+
+
+def _respond(request: Request, name: str, variant: tuple, result: Dict[str, Any]) -> Response:
+    """Send a cached payload with ETag/Cache-Control (max-age = the dataset's TTL), or 304."""
+    _, (ttl, _) = _DATASETS[name]
+    return _rendered.respond(request, (name, *variant), result, max_age=ttl)
+
+
+def _records_to_bars(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Rebuild an OHLCV frame from [{date, open, ...}, ...] (also covers mock KRX data)."""
+    frame = pd.DataFrame.from_records(records, columns=BAR_FIELDS)
+    frame.index = pd.DatetimeIndex(pd.to_datetime(frame.pop("date")))
+    frame.columns = OHLCV_COLUMNS
+    return frame
+
+
+def _to_columnar(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a {data: [bar, ...], ...} payload into parallel arrays."""
+    payload = {k: v for k, v in result.items() if k != "data"}
+    payload["format"] = "columnar"
+    payload.update(records_to_columnar(result["data"], BAR_FIELDS))
+    return payload
+
+
+async def _downsampled_premium(result: Dict[str, Any], size: int) -> Dict[str, Any]:
+    """Reduce the premium line of a payload to `size` points with LTTB."""
+    data = result["data"]
+    days = np.array([d["date"] for d in data], dtype="datetime64[D]").astype(np.int64)
+    premium = np.array([d["premium_pct"] for d in data], dtype=float)
+    keep = lttb(days, premium, size)
+    return {**result, "data": [data[i] for i in keep]}
 
 
 @router.get("/international")
-def get_international_gold(
+async def get_international_gold(
+    request: Request,
     period: str = Query(default="1d", pattern="^(1d|1w|1m|1y|3y|5y)$"),
-    current_user: User = Depends(get_current_user)
-) -> Dict[str, Any]:
+    response_format: str = Query(default="rows", alias="format", pattern="^(rows|columnar)$"),
+    max_points: Optional[int] = Query(default=None, ge=10, le=5000),
+    current_user: Principal = Depends(_authorize)
+) -> Response:
     """
     Get international gold price data (GC=F) from Yahoo Finance.
 
     Args:
         period: Time period (1d, 1w, 1m, 1y, 3y, 5y)
+        response_format: "rows" (list of bar dicts) or "columnar" (parallel arrays with
+            dates as day offsets from epoch_day)
+        max_points: Aggregate daily bars into weekly/monthly/quarterly/yearly
+            candles so that at most this many are returned
         current_user: Authenticated user
 
     Returns:
-        Dict with data array, currency (USD), and unit (oz)
+        Dict with data array (or columnar arrays), currency (USD), and unit (oz);
+        304 if If-None-Match matches the current ETag
     """
-    cache_key = f"intl_gold_{period}"
-    cached = _get_cached(cache_key, ttl=300)
-    if cached:
-        return cached
+    interval, result = await _cached_bars("intl_gold", period, response_format, max_points)
+    return _respond(request, "intl_gold", (period, response_format, interval), result)
+
 
+async def _load_international_gold(period: str) -> Dict[str, Any]:
+    """Slice GC=F bars for the period from the series store and build the response payload."""
     try:
-        start_date, end_date = _get_date_range(period)
-        # yfinance end는 exclusive이므로 하루 추가
-        end_str = (end_date + timedelta(days=1)).strftime("%Y-%m-%d")
-        start_str = start_date.strftime("%Y-%m-%d")
-        ticker = yf.Ticker("GC=F")
-        hist = ticker.history(start=start_str, end=end_str)
+        hist = await _series.get("GC=F", _period_to_days(period))
 
         if hist.empty:
             raise HTTPException(
@@ -86,17 +378,8 @@ def get_international_gold(
                 detail="Failed to fetch international gold data from Yahoo Finance"
             )
 
-        # Convert DataFrame to list of dicts
-        data = []
-        for date_idx, row in hist.iterrows():
-            data.append({
-                "date": date_idx.strftime("%Y-%m-%d"),
-                "open": round(float(row["Open"]), 2),
-                "high": round(float(row["High"]), 2),
-                "low": round(float(row["Low"]), 2),
-                "close": round(float(row["Close"]), 2),
-                "volume": int(row["Volume"]) if row["Volume"] else 0
-            })
+        # Convert DataFrame to list of dicts (column-wise rounding/formatting)
+        data = bars_to_records(hist, decimals=2)
 
         result = {
             "data": data,
@@ -104,7 +387,6 @@ def get_international_gold(
             "unit": "oz"
         }
 
-        _set_cache(cache_key, result)
         return result
 
     except Exception as e:
@@ -115,84 +397,50 @@ def get_international_gold(
 
 
 @router.get("/krx")
-def get_krx_gold(
+async def get_krx_gold(
+    request: Request,
     period: str = Query(default="1d", pattern="^(1d|1w|1m|1y|3y|5y)$"),
-    current_user: User = Depends(get_current_user)
-) -> Dict[str, Any]:
+    response_format: str = Query(default="rows", alias="format", pattern="^(rows|columnar)$"),
+    max_points: Optional[int] = Query(default=None, ge=10, le=5000),
+    current_user: Principal = Depends(_authorize)
+) -> Response:
     """
     Get KRX gold price data from data.go.kr API.
     Falls back to mock data if API fails.
 
     Args:
         period: Time period (1d, 1w, 1m, 1y, 3y, 5y)
+        response_format: "rows" (list of bar dicts) or "columnar" (parallel arrays with
+            dates as day offsets from epoch_day)
+        max_points: Aggregate daily bars into weekly/monthly/quarterly/yearly
+            candles so that at most this many are returned
         current_user: Authenticated user
 
     Returns:
-        Dict with data array, currency (KRW), and unit (g)
+        Dict with data array (or columnar arrays), currency (KRW), and unit (g);
+        304 if If-None-Match matches the current ETag
     """
-    cache_key = f"krx_gold_{period}"
-    cached = _get_cached(cache_key, ttl=3600)
-    if cached:
-        return cached
+    interval, result = await _cached_bars("krx_gold", period, response_format, max_points)
+    return _respond(request, "krx_gold", (period, response_format, interval), result)
 
-    days = _period_to_days(period)
-    end_date = datetime.now()
-    begin_date = end_date - timedelta(days=days)
 
-    # Try to fetch from data.go.kr API
-    service_key = os.environ.get("DATA_GO_KR_API_KEY", "62c4b90a631d34e8d130b6589358d104193ade5e747a4fe0277205dae426a605")
+async def _load_krx_gold(period: str) -> Dict[str, Any]:
+    """Slice KRX bars for the period from the series store, falling back to mock data."""
+    days = _period_to_days(period)
+    begin_date = datetime.now() - timedelta(days=days)
 
     try:
-        url = "https://apis.data.go.kr/1160100/service/GetGeneralProductInfoService/getGoldPriceInfo"
-        # Add one day to end_date to ensure today's data is included
-        end_date_str = (end_date + timedelta(days=1)).strftime("%Y%m%d")
-        params = {
-            "serviceKey": service_key,
-            "resultType": "json",
-            "beginBasDt": begin_date.strftime("%Y%m%d"),
-            "endBasDt": end_date_str,
-            "numOfRows": 1000
-        }
+        hist = await _series.get("KRX", days)
+        if not hist.empty:
+            data = bars_to_records(hist, decimals=0)
 
-        with httpx.Client(timeout=10.0) as client:
-            response = client.get(url, params=params)
-            response.raise_for_status()
-            api_data = response.json()
-
-            # Check if API returned valid data
-            if api_data and "response" in api_data and "body" in api_data["response"]:
-                items = api_data["response"]["body"].get("items", {}).get("item", [])
-                if items:
-                    # Parse API data
-                    data = []
-                    for item in items:
-                        raw_date = item.get("basDt", "")
-                        # YYYYMMDD → YYYY-MM-DD
-                        if len(raw_date) == 8:
-                            formatted_date = f"{raw_date[:4]}-{raw_date[4:6]}-{raw_date[6:8]}"
-                        else:
-                            formatted_date = raw_date
-
-                        data.append({
-                            "date": formatted_date,
-                            "open": int(item.get("mkp", 0)),
-                            "high": int(item.get("hipr", 0)),
-                            "low": int(item.get("lopr", 0)),
-                            "close": int(item.get("clpr", 0)),
-                            "volume": int(item.get("trqu", 0))
-                        })
-
-                    # data.go.kr API는 최신순(내림차순)으로 반환하므로 오름차순 정렬
-                    data.sort(key=lambda x: x["date"])
-
-                    result = {
-                        "data": data,
-                        "currency": "KRW",
-                        "unit": "g"
-                    }
-
-                    _set_cache(cache_key, result)
-                    return result
+            result = {
+                "data": data,
+                "currency": "KRW",
+                "unit": "g"
+            }
+
+            return result
     except Exception:
         pass  # Fall through to mock data
 
@@ -223,47 +471,99 @@ def get_krx_gold(
         "unit": "g"
     }
 
-    _set_cache(cache_key, result)
     return result
 
 
 @router.get("/premium")
-def get_kimchi_premium(
+async def get_kimchi_premium(
+    request: Request,
     period: str = Query(default="1d", pattern="^(1d|1w|1m|1y|3y|5y)$"),
-    current_user: User = Depends(get_current_user)
-) -> Dict[str, Any]:
+    max_points: Optional[int] = Query(default=None, ge=10, le=5000),
+    current_user: Principal = Depends(_authorize)
+) -> Response:
     """
     Calculate kimchi premium for gold (KRX vs International).
 
     Args:
         period: Time period (1d, 1w, 1m, 1y, 3y, 5y)
+        max_points: Downsample the premium line with LTTB to at most this many points
+            (rounded down to one of the fixed LTTB sizes 10, 25, 50, ..., 2500)
         current_user: Authenticated user
 
     Returns:
-        Dict with data array containing premium percentages and prices
+        Dict with data array containing premium percentages and prices;
+        304 if If-None-Match matches the current ETag
     """
-    cache_key = f"gold_premium_{period}"
-    cached = _get_cached(cache_key, ttl=300)
-    if cached:
-        return cached
+    size, result = await _premium_payload(period, max_points)
+    return _respond(request, "gold_premium", (period, size), result)
 
-    try:
-        # Get international gold data
-        start_date, end_date = _get_date_range(period)
-        end_str = (end_date + timedelta(days=1)).strftime("%Y-%m-%d")
-        start_str = start_date.strftime("%Y-%m-%d")
-        gold_ticker = yf.Ticker("GC=F")
-        gold_hist = gold_ticker.history(start=start_str, end=end_str)
 
-        # Get exchange rate data
-        krw_ticker = yf.Ticker("KRW=X")
-        krw_hist = krw_ticker.history(start=start_str, end=end_str)
+async def _premium_payload(period: str, max_points: Optional[int] = None) -> Tuple[Optional[int], Dict[str, Any]]:
+    """
+    Premium payload, reduced with LTTB when `max_points` is given.
+
+    Returns:
+        (LTTB size from lttb_size() or None if not reduced, payload)
+    """
+    result = await _cached("gold_premium", period)
+    size = lttb_size(max_points, len(result["data"])) if max_points else None
+    if size is None:
+        return None, result
+    return size, await _derived(
+        "gold_premium", f"gold_premium_{period}_lttb{size}", partial(_downsampled_premium, result, size),
+    )
+
+
+def _asof(series: pd.Series, index: pd.DatetimeIndex, default: float) -> pd.Series:
+    """Align `series` onto `index` using the latest value at or before each date."""
+    series = series[~series.index.duplicated(keep="last")].sort_index()
+    aligned = series.reindex(index, method="ffill")
+    # Dates before the first observation use the most recent value (or the default)
+    return aligned.fillna(float(series.iloc[-1]) if len(series) else default)
+
+
+def _compute_premium(gold_close: pd.Series, usd_krw: pd.Series, krx_close: pd.Series) -> pd.DataFrame:
+    """
+    Compute the kimchi premium for every gold date with column operations.
+
+    Args:
+        gold_close: GC=F close in USD/oz, indexed by date
+        usd_krw: USD/KRW close, indexed by date
+        krx_close: KRX close in KRW/g, indexed by date
+
+    Returns:
+        DataFrame indexed like gold_close with premium_pct, krx_price and intl_price_krw
+    """
+    index = gold_close.index
+    fx = _asof(usd_krw, index, default=1300.0)  # Fallback rate
+    krx_price = _asof(krx_close, index, default=95000.0)
+
+    # Convert to KRW per gram (1 oz = 31.1035 g)
+    intl_price_krw = gold_close / TROY_OUNCE_GRAMS * fx
+    premium_pct = (krx_price / intl_price_krw - 1) * 100
+
+    return pd.DataFrame({
+        "premium_pct": premium_pct,
+        "krx_price": krx_price,
+        "intl_price_krw": intl_price_krw,
+    }, index=index)
 
+
+async def _load_kimchi_premium(period: str) -> Dict[str, Any]:
+    """Compute the KRX vs international premium series for the period."""
+    try:
+        days = _period_to_days(period)
         # Get KRX data - fetch wider period to match international data
-        krx_period_map = {"1d": "1m", "1w": "1m", "1m": "1m", "1y": "1y", "3y": "3y", "5y": "5y"}
-        krx_fetch_period = krx_period_map.get(period, period)
-        krx_response = get_krx_gold(period=krx_fetch_period, current_user=current_user)
-        krx_data = {item["date"]: item for item in krx_response["data"]}
+        krx_fetch_period = _PREMIUM_KRX_PERIOD.get(period, period)
+
+        # International gold, exchange rate and KRX data are independent: fetch concurrently
+        gold_hist, krw_hist, krx_response = await asyncio.gather(
+            _series.get("GC=F", days),
+            _series.get("KRW=X", days),
+            _cached("krx_gold", krx_fetch_period),
+        )
+        krx_frame = pd.DataFrame(krx_response["data"], columns=["date", "close"])
+        krx_close = pd.Series(krx_frame["close"].to_numpy(), index=pd.to_datetime(krx_frame["date"]))
 
         if gold_hist.empty or krw_hist.empty:
             raise HTTPException(
@@ -271,47 +571,16 @@ def get_kimchi_premium(
                 detail="Failed to fetch required data for premium calculation"
             )
 
-        # Calculate premium for each date
-        data = []
-
-        for date_idx, gold_row in gold_hist.iterrows():
-            date_str = date_idx.strftime("%Y-%m-%d")
-
-            # Get closest exchange rate
-            try:
-                if date_idx in krw_hist.index:
-                    usd_krw = float(krw_hist.loc[date_idx, "Close"])
-                else:
-                    # Use most recent available rate
-                    usd_krw = float(krw_hist["Close"].iloc[-1])
-            except (KeyError, IndexError):
-                usd_krw = 1300.0  # Fallback rate
-
-            # Get international price per oz
-            intl_price_per_oz = float(gold_row["Close"])
-
-            # Convert to KRW per gram (1 oz = 31.1035 g)
-            intl_price_krw_per_g = (intl_price_per_oz / 31.1035) * usd_krw
-
-            # Get KRX price
-            if date_str in krx_data:
-                krx_price = krx_data[date_str]["close"]
-            else:
-                # Use most recent KRX price
-                krx_price = list(krx_data.values())[-1]["close"] if krx_data else 95000
-
-            # Calculate premium percentage
-            premium_pct = ((krx_price / intl_price_krw_per_g) - 1) * 100
+        premium = _compute_premium(gold_hist["Close"], krw_hist["Close"], krx_close)
 
-            data.append({
-                "date": date_str,
-                "premium_pct": round(premium_pct, 2),
-                "krx_price": round(krx_price),
-                "intl_price_krw": round(intl_price_krw_per_g)
-            })
+        data = columns_to_records({
+            "date": premium.index.strftime("%Y-%m-%d").tolist(),
+            "premium_pct": premium["premium_pct"].round(2).tolist(),
+            "krx_price": premium["krx_price"].round().astype("int64").tolist(),
+            "intl_price_krw": premium["intl_price_krw"].round().astype("int64").tolist(),
+        }, PREMIUM_FIELDS)
 
         result = {"data": data}
-        _set_cache(cache_key, result)
         return result
 
     except HTTPException:
@@ -324,83 +593,86 @@ def get_kimchi_premium(
 
 
 @router.get("/recommendation")
-def get_gold_recommendation(
+async def get_gold_recommendation(
+    request: Request,
     period: str = Query(default="1m", pattern="^(1d|1w|1m|1y|3y|5y)$"),
-    current_user: User = Depends(get_current_user)
-) -> Dict[str, Any]:
+    current_user: Principal = Depends(_authorize)
+) -> Response:
     """
     Get gold investment recommendation based on technical analysis.
 
-    Logic:
+    Logic (default rule set, replaceable via GOLD_RULES_FILE):
     - Buy: MA5 > MA20 and premium < 3%
     - Sell: MA5 < MA20 or premium > 5%
     - Hold: Otherwise
 
+    Indicators (SMA, EMA, RSI, Bollinger bands, ATR) are kept up to date
+    incrementally as new GC=F bars arrive over the whole stored history, so
+    the result does not depend on the period.
+
     Args:
-        period: Time period for analysis (1d, 1w, 1m, 1y, 3y, 5y)
+        period: Accepted for compatibility (1d, 1w, 1m, 1y, 3y, 5y); every period gets the same result
         current_user: Authenticated user
 
     Returns:
-        Dict with signal, reasons, moving averages, premium, and price info
+        Dict with signal, reasons, moving averages, premium, price info and
+        the current indicator values;
+        304 if If-None-Match matches the current ETag
+    """
+    return _respond(request, "gold_rec", (), await _cached("gold_rec", period))
+
+
+async def _load_gold_recommendation(period: str) -> Dict[str, Any]:
     """
-    cache_key = f"gold_rec_{period}"
-    cached = _get_cached(cache_key, ttl=300)
-    if cached:
-        return cached
+    Evaluate the recommendation rule set on the streaming GC=F indicators and the current premium.
 
+    `period` is always ALL_PERIODS (see PERIODLESS_DATASETS).
+    """
     try:
-        # Get international gold data
-        start_date, end_date = _get_date_range(period)
-        end_str = (end_date + timedelta(days=1)).strftime("%Y-%m-%d")
-        start_str = start_date.strftime("%Y-%m-%d")
-        ticker = yf.Ticker("GC=F")
-        hist = ticker.history(start=start_str, end=end_str)
-
-        if hist.empty or len(hist) < 20:
+        # Reading GC=F refreshes it (and advances the indicators) when stale;
+        # only that side effect is needed, the bars are not. The premium is
+        # fetched concurrently
+        refreshed, premium_response = await asyncio.gather(
+            _series.get("GC=F", 1),
+            _cached("gold_premium", "1d"),
+            return_exceptions=True,
+        )
+        if isinstance(refreshed, BaseException):
+            raise refreshed
+
+        values = _gold_indicators.snapshot()
+        if values["sma20"] is None or values["prev_close"] is None:
             raise HTTPException(
                 status_code=503,
                 detail="Insufficient data for recommendation analysis"
             )
 
-        # Calculate moving averages
-        close_prices = hist["Close"]
-        ma5 = float(close_prices.tail(5).mean())
-        ma20 = float(close_prices.tail(20).mean())
+        ma5 = values["sma5"]
+        ma20 = values["sma20"]
 
         # Get current price and calculate change
-        current_price = float(close_prices.iloc[-1])
-        previous_price = float(close_prices.iloc[-2]) if len(close_prices) > 1 else current_price
+        current_price = values["close"]
+        previous_price = values["prev_close"]
         price_change_pct = ((current_price - previous_price) / previous_price) * 100
 
         # Get kimchi premium
         try:
-            premium_response = get_kimchi_premium(period="1d", current_user=current_user)
+            if isinstance(premium_response, BaseException):
+                raise premium_response
             premium_pct = premium_response["data"][-1]["premium_pct"] if premium_response["data"] else 0.0
         except Exception:
             premium_pct = 0.0
 
-        # Determine signal and reasons
-        reasons = []
+        # Signal logic (configurable rule set; default: MA5/MA20 + premium 3%/5%)
+        inputs = {**values, "premium_pct": premium_pct}
+        signal, fired = GOLD_RULES.explain(inputs)
 
-        if ma5 > ma20:
-            reasons.append("5일 이동평균이 20일 이동평균을 상회")
+        # Reasons: the familiar MA/premium summary for the default rules, otherwise
+        # the conditions of the configured rule set that decided the signal
+        if GOLD_RULES is DEFAULT_RULES:
+            reasons = _default_rule_reasons(ma5, ma20, premium_pct)
         else:
-            reasons.append("5일 이동평균이 20일 이동평균을 하회")
-
-        if premium_pct < 3:
-            reasons.append(f"김치 프리미엄 {premium_pct:.1f}% (적정 수준)")
-        elif premium_pct > 5:
-            reasons.append(f"김치 프리미엄 {premium_pct:.1f}% (과열)")
-        else:
-            reasons.append(f"김치 프리미엄 {premium_pct:.1f}% (보통)")
-
-        # Signal logic
-        if ma5 > ma20 and premium_pct < 3:
-            signal = "buy"
-        elif ma5 < ma20 or premium_pct > 5:
-            signal = "sell"
-        else:
-            signal = "hold"
+            reasons = [condition.describe(inputs) for condition in fired] or ["매수/매도 조건을 충족하지 않음"]
 
         result = {
             "signal": signal,
@@ -409,10 +681,13 @@ def get_gold_recommendation(
             "ma20": round(ma20, 2),
             "premium_pct": round(premium_pct, 2),
             "current_price": round(current_price, 2),
-            "price_change_pct": round(price_change_pct, 2)
+            "price_change_pct": round(price_change_pct, 2),
+            "indicators": {
+                name: round(value, 2) for name, value in values.items()
+                if value is not None and name not in ("close", "prev_close")
+            },
         }
 
-        _set_cache(cache_key, result)
         return result
 
     except HTTPException:
@@ -422,3 +697,430 @@ def get_gold_recommendation(
             status_code=503,
             detail=f"Error generating recommendation: {str(e)}"
         )
+
+
+def _default_rule_reasons(ma5: float, ma20: float, premium_pct: float) -> List[str]:
+    """Reasons matching DEFAULT_RULES (MA5/MA20 crossover, premium 3%/5%)."""
+    reasons = []
+
+    if ma5 > ma20:
+        reasons.append("5일 이동평균이 20일 이동평균을 상회")
+    else:
+        reasons.append("5일 이동평균이 20일 이동평균을 하회")
+
+    if premium_pct < 3:
+        reasons.append(f"김치 프리미엄 {premium_pct:.1f}% (적정 수준)")
+    elif premium_pct > 5:
+        reasons.append(f"김치 프리미엄 {premium_pct:.1f}% (과열)")
+    else:
+        reasons.append(f"김치 프리미엄 {premium_pct:.1f}% (보통)")
+
+    return reasons
+
+
+@router.get("/recommendation/backtest")
+async def backtest_gold_recommendation(
+    request: Request,
+    period: str = Query(default="1y", pattern="^(1y|3y|5y)$"),
+    horizon: int = Query(default=1, ge=1, le=60, description="Trading days ahead used to score a signal"),
+    rules: Optional[str] = Query(default=None, description='JSON rule set, e.g. {"buy": [["sma5", ">", "sma20"]], "sell": []}'),
+    current_user: Principal = Depends(_authorize)
+) -> Response:
+    """
+    Evaluate the recommendation rule set for every trading day of the period.
+
+    Indicators and signals are computed for the whole window at once from the
+    stored GC=F bars and the premium series (no per-day recommendation calls).
+    Each day's signal uses that day's close and premium only.
+
+    Args:
+        period: Backtest window (1y, 3y, 5y)
+        horizon: A buy is a hit if the close `horizon` days later is higher, a sell if it is lower
+        rules: Rule set to test instead of the configured one (computed per
+            request, not cached)
+        current_user: Authenticated user
+
+    Returns:
+        Dict with the daily signal history and equity curve (long after buy,
+        flat after sell), the rule set used and summary figures incl. hit_rate;
+        304 if If-None-Match matches the current ETag
+    """
+    if rules is None:
+        result = await _derived(
+            "gold_rec", f"gold_rec_backtest_{period}_{horizon}",
+            partial(_load_recommendation_backtest, period, horizon, GOLD_RULES),
+        )
+        return _respond(request, "gold_rec", ("backtest", period, horizon), result)
+
+    try:
+        rule_set = RuleSet.from_dict(json.loads(rules), RULE_OPERANDS)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid rules: {e}")
+    # Custom rule sets stay out of the shared caches: every distinct rules
+    # string would otherwise take a slot and evict the dataset entries
+    result = await _load_recommendation_backtest(period, horizon, rule_set)
+    body = render_json(result)
+    etag = make_etag(body)
+    max_age = RECOMMENDATION_TTL[0]
+    return not_modified(request, etag, max_age) or Response(
+        content=body, media_type="application/json", headers=cache_headers(etag, max_age)
+    )
+
+
+async def _load_recommendation_backtest(period: str, horizon: int, rule_set: RuleSet) -> Dict[str, Any]:
+    """Vectorized signal history, hit rate and equity curve of `rule_set` over the period."""
+    try:
+        days = _period_to_days(period)
+        # Extra history so the slowest indicator is warmed up on the first day
+        gold_hist, premium_response = await asyncio.gather(
+            _series.get("GC=F", days + BACKTEST_WARMUP_DAYS),
+            _cached("gold_premium", period),
+        )
+        gold_hist = gold_hist[gold_hist["Close"].notna()]
+        premium_frame = pd.DataFrame(premium_response["data"], columns=["date", "premium_pct"])
+        if gold_hist.empty or premium_frame.empty:
+            raise HTTPException(status_code=503, detail="Insufficient data for backtest")
+        premium = pd.Series(premium_frame["premium_pct"].to_numpy(dtype=float), index=pd.to_datetime(premium_frame["date"]))
+
+        columns = indicator_columns(gold_hist)
+        columns["premium_pct"] = _asof(premium, gold_hist.index, default=0.0).to_numpy()
+        signals = rule_set.evaluate_columns(columns, len(gold_hist))
+
+        start = int(gold_hist.index.searchsorted(premium.index.min()))
+        dates = gold_hist.index[start:]
+        close = columns["close"][start:]
+        signals = signals[start:]
+        outcome = backtest_signals(close, signals, horizon)
+
+        data = columns_to_records({
+            "date": dates.strftime("%Y-%m-%d").tolist(),
+            "signal": signals.tolist(),
+            "close": np.round(close, 2).tolist(),
+            "premium_pct": np.round(columns["premium_pct"][start:], 2).tolist(),
+            "hit": outcome["hit"].tolist(),
+            "equity": np.round(outcome["equity"], 4).tolist(),
+            "benchmark": np.round(outcome["benchmark"], 4).tolist(),
+        }, BACKTEST_FIELDS)
+
+        summary = {
+            key: round(value, 4) if isinstance(value, float) else value
+            for key, value in outcome["summary"].items()
+        }
+        return {"period": period, "horizon": horizon, "rules": rule_set.to_dict(), "summary": summary, "data": data}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Error running backtest: {str(e)}"
+        )
+
+
+@router.post("/batch")
+async def get_gold_batch(
+    batch: GoldBatchRequest,
+    current_user: Principal = Depends(_authorize)
+) -> Response:
+    """
+    Load the data of several dashboard widgets with one authenticated request.
+
+    Identical items are loaded once, and items sharing upstream series (e.g.
+    premium and recommendation) share the cached datasets and in-flight
+    downloads. A failing item does not fail the batch: its entry carries the
+    error status and detail instead of data.
+
+    Args:
+        batch: Items of {type, period, format?, max_points?}; type is one of
+            international_gold, krx_gold, kimchi_premium, gold_recommendation
+        current_user: Authenticated user
+
+    Returns:
+        {"results": [{type, period, status, data | detail}, ...]} in request order.
+        Not cacheable: conditional requests (ETag/304) are only served by the
+        GET endpoints
+    """
+    keys = [_batch_key(item) for item in batch.items]
+    unique = list(dict.fromkeys(keys))
+    outcomes = dict(zip(unique, await asyncio.gather(
+        *(_widget_data(*key) for key in unique), return_exceptions=True
+    )))
+
+    # Each item's body is the same memoized rendering the single endpoints send
+    parts: List[bytes] = []
+    for item, key in zip(batch.items, keys):
+        outcome = outcomes[key]
+        head = {"type": item.type, "period": item.period}
+        if isinstance(outcome, BaseException):
+            status, detail = (
+                (outcome.status_code, outcome.detail) if isinstance(outcome, HTTPException) else (503, str(outcome))
+            )
+            part = render_json({**head, "status": status, "detail": detail})
+        else:
+            name, variant, payload = outcome
+            body, _ = _rendered.render((name, *variant), payload)
+            part = render_json({**head, "status": 200})[:-1] + b',"data":' + body + b"}"
+        parts.append(part)
+
+    return Response(content=b'{"results":[' + b",".join(parts) + b"]}", media_type="application/json")
+
+
+def _batch_key(item: GoldBatchItem) -> tuple:
+    """Normalized (type, period, format, max_points): options a widget type ignores are dropped."""
+    if item.type == "gold_recommendation":
+        return (item.type, ALL_PERIODS, "rows", None)
+    if item.type == "kimchi_premium":
+        return (item.type, item.period, "rows", item.max_points)
+    return (item.type, item.period, item.format, item.max_points)
+
+
+async def _widget_data(
+    widget_type: str, period: str, response_format: str, max_points: Optional[int]
+) -> Tuple[str, tuple, Dict[str, Any]]:
+    """(dataset name, render variant, payload) of one batch item, as the matching endpoint would send it."""
+    if widget_type == "gold_recommendation":
+        return "gold_rec", (), await _cached("gold_rec", period)
+    if widget_type == "kimchi_premium":
+        size, payload = await _premium_payload(period, max_points)
+        return "gold_premium", (period, size), payload
+    name = "intl_gold" if widget_type == "international_gold" else "krx_gold"
+    interval, payload = await _cached_bars(name, period, response_format, max_points)
+    return name, (period, response_format, interval), payload
+
+
+@router.get("/stream")
+async def stream_gold_updates(
+    channels: str = Query(default=",".join(STREAM_CHANNELS), description="Comma-separated channels"),
+    period: str = Query(default="1d", pattern="^(1d|1w|1m|1y|3y|5y)$"),
+    current_user: TokenPrincipal = Depends(get_stream_principal)
+) -> StreamingResponse:
+    """
+    Server-Sent Events stream of gold data for one period.
+
+    On connect a `snapshot` event with the full payload is sent per channel;
+    afterwards, whenever the background refresh produces new values, an
+    `update` event carries only what changed: new or revised bars/points
+    (`type: "bars"`), a changed recommendation (`type: "signal"`), or a full
+    payload if older history changed (`type: "snapshot"`).
+
+    Args:
+        channels: Any of international, krx, premium, recommendation
+        period: Time period (1d, 1w, 1m, 1y, 3y, 5y)
+        current_user: Authenticated via Authorization header or access_token query parameter
+
+    Returns:
+        text/event-stream response
+    """
+    requested = list(dict.fromkeys(c.strip() for c in channels.split(",") if c.strip()))
+    unknown = [c for c in requested if c not in STREAM_CHANNELS]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown channels: {', '.join(unknown)}" if unknown else "No channels requested"
+        )
+    if _broadcaster.stats()["subscribers"] >= _broadcaster.max_subscribers:
+        raise HTTPException(status_code=503, detail="Too many open streams")
+
+    return StreamingResponse(
+        _event_stream(requested, period),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + render_json(data) + b"\n\n"
+
+
+async def _event_stream(channels: List[str], period: str) -> AsyncIterator[bytes]:
+    """Subscribe first, then send snapshots, so no refresh is missed in between."""
+    try:
+        subscription = _broadcaster.subscribe((channel, period) for channel in channels)
+    except RuntimeError as e:
+        yield _sse("error", {"detail": str(e)})
+        return
+
+    with subscription:
+        yield b"retry: 5000\n\n"
+        snapshots = await asyncio.gather(
+            *(_cached(STREAM_CHANNELS[channel], period) for channel in channels),
+            return_exceptions=True,
+        )
+        for channel, payload in zip(channels, snapshots):
+            if isinstance(payload, BaseException):
+                detail = payload.detail if isinstance(payload, HTTPException) else str(payload)
+                yield _sse("error", {"channel": channel, "period": period, "detail": detail})
+            else:
+                yield _sse("snapshot", {"channel": channel, "period": period, "type": "snapshot", "payload": payload})
+
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.get(), timeout=STREAM_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            yield _sse("update", message)
+
+
+def _dataset_delta(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Describe how a dataset payload changed, or None if it did not.
+
+    Dated series send only records after (or revising) the previous last
+    record; anything else falls back to the full payload.
+    """
+    if previous == current:
+        return None
+    if "data" not in current:
+        return {"type": "signal", "payload": current}
+    if not previous or not previous.get("data") or not current["data"]:
+        return {"type": "snapshot", "payload": current}
+
+    last = previous["data"][-1]
+    changed = []
+    for record in reversed(current["data"]):
+        if record["date"] < last["date"]:
+            break
+        if record != last:
+            changed.append(record)
+    if not changed:
+        # Only older history changed (revision or moved window)
+        return {"type": "snapshot", "payload": current}
+    return {"type": "bars", "data": changed[::-1]}
+
+
+def _publish_update(name: str, period: str, previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> None:
+    channel = _DATASET_CHANNELS[name]
+    # A period-independent snapshot goes to the subscribers of every period
+    periods = PERIODS if period == ALL_PERIODS else (period,)
+    topics = [(channel, p) for p in periods if _broadcaster.has_subscribers((channel, p))]
+    if not topics:
+        return
+    delta = _dataset_delta(previous, current)
+    if delta is None:
+        return
+    for topic in topics:
+        _broadcaster.publish(topic, {"channel": channel, "period": topic[1], **delta})
+
+
+@router.get("/cache/stats")
+def get_cache_stats(current_user: Principal = Depends(_authorize)) -> Dict[str, Any]:
+    """
+    Get gold cache counters (hits, misses, evictions, ...) and upstream health.
+
+    Args:
+        current_user: Authenticated user
+
+    Returns:
+        Dict with cache statistics, upstream circuit breaker states, stream
+        subscribers, background job health and the newest stored bar per series
+    """
+    stats = _cache.stats()
+    try:
+        stats["upstream"] = get_upstream_client().stats()
+    except RuntimeError:
+        stats["upstream"] = {}
+    stats["stream"] = _broadcaster.stats()
+    stats["materialized"] = _materialized.stats()
+    stats["shared"] = _shared.stats() if _shared is not None else None
+    stats["scheduler"] = _scheduler.status()
+    stats["series"] = {}
+    for symbol in MATERIALIZED_SERIES:
+        last = _series.last_date(symbol)
+        stats["series"][symbol] = None if last is None else last.date().isoformat()
+    return stats
+
+
+# Dataset name -> (loader, (ttl, stale_ttl)); the name prefixes the cache key
+_DATASETS = {
+    "intl_gold": (_load_international_gold, INTL_TTL),
+    "krx_gold": (_load_krx_gold, KRX_TTL),
+    "gold_premium": (_load_kimchi_premium, PREMIUM_TTL),
+    "gold_rec": (_load_gold_recommendation, RECOMMENDATION_TTL),
+}
+
+
+# Snapshot of every dataset and period, rebuilt by the background refresh.
+# Inputs are the stored bars of each upstream series plus the calendar date
+# (period windows end today); only the outputs downstream of a changed input
+# are recomputed, and requests read the snapshots directly.
+#
+#   series:GC=F ---------+--> intl_gold_<p>
+#   series:KRW=X ----+   +--> gold_premium_<p> <-- krx_gold_<1m|1y|3y|5y> <-- series:KRX
+#   calendar (all) --+   +--> gold_rec_all <-- gold_premium_1d
+_materialized = Materializer()
+MATERIALIZED_SERIES = ("GC=F", "KRW=X", "KRX")
+
+
+def _build_materialization_graph() -> None:
+    for symbol in MATERIALIZED_SERIES:
+        _materialized.add_source(f"series:{symbol}")
+    _materialized.add_source("calendar")
+
+    inputs = {
+        "intl_gold": lambda period: ("series:GC=F", "calendar"),
+        "krx_gold": lambda period: ("series:KRX", "calendar"),
+        "gold_premium": lambda period: (
+            "series:GC=F", "series:KRW=X", f"krx_gold_{_PREMIUM_KRX_PERIOD[period]}", "calendar",
+        ),
+        # The indicators use the whole GC=F history, not the period window
+        "gold_rec": lambda period: ("series:GC=F", "gold_premium_1d"),
+    }
+    # Dependencies first: the premium reads KRX snapshots, the recommendation the 1d premium
+    for name in ("intl_gold", "krx_gold", "gold_premium", "gold_rec"):
+        loader, _ = _DATASETS[name]
+        for period in (ALL_PERIODS,) if name in PERIODLESS_DATASETS else PERIODS:
+            _materialized.add(
+                f"{name}_{period}",
+                partial(loader, period),
+                inputs[name](period),
+                on_change=partial(_publish_update, name, period),
+            )
+
+
+_build_materialization_graph()
+
+
+async def _refresh_materialized() -> None:
+    """Refresh the upstream series (each when older than its max age) and recompute affected snapshots."""
+    results = await asyncio.gather(
+        *(_series.get(symbol, 1) for symbol in MATERIALIZED_SERIES), return_exceptions=True
+    )
+    for symbol, result in zip(MATERIALIZED_SERIES, results):
+        if isinstance(result, BaseException):
+            logger.warning("Failed to refresh %s: %s", symbol, result)
+
+    versions: Dict[str, Any] = {f"series:{symbol}": _series.version(symbol) for symbol in MATERIALIZED_SERIES}
+    versions["calendar"] = datetime.now().date()
+    report = await _materialized.update(versions)
+    if report["errors"]:
+        # Raise so the scheduler backs off; failed snapshots are retried on the next run
+        failed = "; ".join(f"{name}: {error}" for name, error in report["errors"].items())
+        raise RuntimeError(f"Failed to materialize {failed}")
+
+
+def warm_series_from_disk() -> Dict[str, int]:
+    """Load persisted bars into the series store (called from the app lifespan)."""
+    return _series.warm()
+
+
+def start_background_refresh() -> None:
+    """Register the snapshot refresh job and start it (called from the app lifespan)."""
+    if not REFRESH_ENABLED or _scheduler.running:
+        return
+    # Runs at the pace of the fastest-changing input; slower series (KRX) are
+    # only re-fetched once their own max age has passed
+    interval = min(ttl for _, (ttl, _) in _DATASETS.values()) * REFRESH_TTL_RATIO
+    _scheduler.add_job("materialize", _refresh_materialized, interval=interval)
+    _scheduler.start()
+
+
+async def stop_background_refresh() -> None:
+    """Stop all refresh jobs."""
+    await _scheduler.stop()
+
+
+def close_shared_cache() -> None:
+    """Release the host-wide cache's connections (called from the app lifespan)."""
+    if _shared is not None:
+        _shared.backend.close()
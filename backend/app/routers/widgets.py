@@ -1,8 +1,14 @@
-import json
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Optional
 
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal, get_async_db, get_async_read_db
 from app.models.user import User
 from app.models.widget import Widget
 from app.schemas.widget import (
@@ -11,82 +17,208 @@ from app.schemas.widget import (
     WidgetResponse,
     LayoutBatchUpdate
 )
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_user_async
+from app.utils.http_cache import cache_headers, make_etag, not_modified
+from app.utils.write_buffer import WriteBehindBuffer
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/widgets", tags=["widgets"])
 
+# 레이아웃 저장 방식
+# - 기본(LAYOUT_FLUSH_DELAY=0): write-through, 응답 전에 DB에 저장
+# - LAYOUT_FLUSH_DELAY>0: write-behind (선택), 사용자별로 모아 위젯당 최신 위치만 한 트랜잭션으로 저장
+#   주의: 응답 후 저장되므로 프로세스가 비정상 종료(SIGKILL 등)되면 최대 LAYOUT_FLUSH_MAX_DELAY초의
+#   변경이 유실될 수 있고, 버퍼가 프로세스마다 있어 단일 워커에서만 사용해야 함
+#   (여러 워커면 다른 워커의 GET이 아직 저장되지 않은 레이아웃을 보지 못함)
+LAYOUT_FLUSH_DELAY = float(os.getenv("LAYOUT_FLUSH_DELAY", "0"))
+LAYOUT_FLUSH_MAX_DELAY = float(os.getenv("LAYOUT_FLUSH_MAX_DELAY", "2"))
+
+# 소유자 조건을 포함한 레이아웃 UPDATE (executemany, 그 사이 삭제된 위젯은 0행 갱신으로 무시)
+_LAYOUT_UPDATE = (
+    update(Widget.__table__)
+    .where(Widget.__table__.c.id == bindparam("b_id"), Widget.__table__.c.user_id == bindparam("b_user_id"))
+    .values(layout=bindparam("b_layout"), updated_at=bindparam("b_updated_at"))
+)
+
+
+def _write_layouts(user_id: int, layouts: dict[int, tuple[dict, datetime]]) -> None:
+    """버퍼에 모인 한 사용자의 레이아웃을 단일 트랜잭션으로 저장합니다 (버퍼 스레드에서 실행)."""
+    db = SessionLocal()
+    try:
+        db.execute(
+            _LAYOUT_UPDATE,
+            [
+                {"b_id": widget_id, "b_user_id": user_id, "b_layout": layout, "b_updated_at": updated_at}
+                for widget_id, (layout, updated_at) in layouts.items()
+            ],
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# 위젯 목록 응답의 Cache-Control max-age (변경 여부는 ETag로 재검증)
+WIDGETS_MAX_AGE = int(os.getenv("WIDGETS_MAX_AGE", "0"))
+
+_layout_buffer = WriteBehindBuffer(_write_layouts, delay=LAYOUT_FLUSH_DELAY, max_delay=LAYOUT_FLUSH_MAX_DELAY)
+
+
+def flush_pending_layouts() -> None:
+    """버퍼에 남은 모든 레이아웃을 저장합니다 (앱 종료 시 호출)."""
+    _layout_buffer.flush_all()
+
+
+async def _flush_user_layouts(user_id: int) -> None:
+    # 읽기 전 저장 (실패 시 레이아웃은 버퍼에 남아 다음 저장 때 재시도)
+    # 대기/진행 중인 저장이 있을 때만 스레드에서 실행해 이벤트 루프를 막지 않음
+    if _layout_buffer.is_idle(user_id):
+        return
+    try:
+        await asyncio.to_thread(_layout_buffer.flush, user_id)
+    except Exception:
+        logger.warning("Layout flush failed for user %s", user_id, exc_info=True)
+
+
+async def _discard_user_layouts(user_id: int, widget_ids: Optional[list[int]] = None) -> None:
+    # 진행 중인 저장이 끝날 때까지 기다려야 하므로 스레드에서 실행
+    if not _layout_buffer.is_idle(user_id):
+        await asyncio.to_thread(_layout_buffer.discard, user_id, widget_ids)
+
+
+async def _submit_user_layouts(user_id: int, layouts: dict[int, tuple[dict, datetime]]) -> None:
+    if LAYOUT_FLUSH_DELAY > 0:
+        _layout_buffer.submit(user_id, layouts)
+    else:
+        # write-through 모드는 submit 안에서 DB에 저장 (실패하면 버퍼에 남기지 않고 500으로 응답)
+        await asyncio.to_thread(_layout_buffer.submit, user_id, layouts)
+
 
 def serialize_widget(widget: Widget) -> WidgetResponse:
     """
     Widget 모델을 WidgetResponse로 변환.
-    JSON 문자열을 dict로 파싱합니다.
+    config/layout은 JSON 컬럼에서 dict로 로드되므로 그대로 사용합니다.
     """
     return WidgetResponse(
         id=widget.id,
         user_id=widget.user_id,
         name=widget.name,
         type=widget.type,
-        config=json.loads(widget.config) if widget.config else None,
-        layout=json.loads(widget.layout),
+        config=widget.config,
+        layout=widget.layout,
         created_at=widget.created_at,
         updated_at=widget.updated_at
     )
 
 
+def _now_utc() -> datetime:
+    # updated_at 저장 형식 (DB 기본값과 같은 naive UTC, 마이크로초 포함)
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def _widgets_etag(db: AsyncSession, user_id: int, pending: dict) -> str:
+    """위젯 (id, created_at, updated_at) 목록으로 ETag를 계산합니다 (본문 조회/직렬화 없음)."""
+    versions = (await db.execute(
+        select(Widget.id, Widget.created_at, Widget.updated_at)
+        .where(Widget.user_id == user_id)
+        .order_by(Widget.id)
+    )).all()
+    fingerprint = repr((user_id, [tuple(row) for row in versions], sorted(pending.items())))
+    return make_etag(fingerprint.encode())
+
+
 @router.get("", response_model=list[WidgetResponse])
-def get_user_widgets(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_user_widgets(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     현재 사용자의 모든 위젯을 조회합니다.
 
     - 인증 필요
     - user_id로 필터링하여 사용자 격리 보장
+    - 버퍼에 남은 레이아웃을 먼저 저장하므로 항상 최신 레이아웃을 반환
+    - 위젯의 updated_at 기반 ETag 제공, If-None-Match가 일치하면 304 반환
+    - 읽기 전용 세션 사용 (쓰기 트랜잭션과 경합하지 않음)
     """
-    widgets = db.query(Widget).filter(Widget.user_id == current_user.id).all()
-    return [serialize_widget(widget) for widget in widgets]
+    await _flush_user_layouts(current_user.id)
+    # 저장에 실패해 남아 있는 레이아웃은 응답에 덮어써서 반환
+    pending = _layout_buffer.pending(current_user.id)
+
+    etag = await _widgets_etag(db, current_user.id, pending)
+    cached = not_modified(request, etag, WIDGETS_MAX_AGE)
+    if cached is not None:
+        return cached
+    response.headers.update(cache_headers(etag, WIDGETS_MAX_AGE))
+
+    widgets = (await db.execute(select(Widget).where(Widget.user_id == current_user.id))).scalars().all()
+    responses = [serialize_widget(widget) for widget in widgets]
+    if pending:
+        responses = [
+            response.model_copy(update={
+                "layout": pending[response.id][0],
+                "updated_at": pending[response.id][1],
+            }) if response.id in pending else response
+            for response in responses
+        ]
+    return responses
 
 
 @router.post("", response_model=WidgetResponse, status_code=status.HTTP_201_CREATED)
-def create_widget(
+async def create_widget(
     widget_data: WidgetCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     새 위젯을 생성합니다.
 
     - 인증 필요
     - user_id는 현재 로그인한 사용자로 자동 설정
-    - config와 layout은 JSON 문자열로 저장
+    - config와 layout은 JSON 컬럼에 dict로 저장
     """
     new_widget = Widget(
         user_id=current_user.id,
         name=widget_data.name,
         type=widget_data.type,
-        config=json.dumps(widget_data.config) if widget_data.config else None,
-        layout=json.dumps(widget_data.layout.model_dump())
+        config=widget_data.config or None,
+        layout=widget_data.layout.model_dump()
     )
 
     try:
         db.add(new_widget)
-        db.commit()
-        db.refresh(new_widget)
+        await db.commit()
+        # id와 서버 기본값(created_at) 로드
+        await db.refresh(new_widget)
         return serialize_widget(new_widget)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create widget: {str(e)}"
         )
 
 
+def _parse_layout_widget_id(layout_key: str) -> Optional[int]:
+    """레이아웃 키("widget_123" 또는 "123")에서 위젯 ID를 추출합니다. 실패 시 None."""
+    try:
+        if layout_key.startswith("widget_"):
+            return int(layout_key.replace("widget_", ""))
+        return int(layout_key)
+    except ValueError:
+        return None
+
+
 @router.put("/layout", response_model=list[WidgetResponse])
-def batch_update_layouts(
+async def batch_update_layouts(
     batch_data: LayoutBatchUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     여러 위젯의 레이아웃을 일괄 업데이트합니다.
@@ -94,54 +226,66 @@ def batch_update_layouts(
     - 인증 필요
     - 각 위젯의 소유권 검증
     - 존재하지 않는 위젯 ID는 무시
+    - 위젯 수와 무관하게 SELECT 1회(IN)로 소유권 검증
+    - 기본은 응답 전에 한 트랜잭션으로 저장 (write-through)
+    - LAYOUT_FLUSH_DELAY>0이면 write-behind 버퍼로 짧은 시간 동안의 변경을 모아 저장
+      (단일 워커 전용, 응답 후 저장되므로 비정상 종료 시 유실 가능)
     """
-    updated_widgets = []
-
+    # 위젯 ID별 최신 레이아웃 (같은 ID가 여러 번 오면 마지막 값 사용, 순서는 첫 등장 기준)
+    layouts: dict[int, dict] = {}
     for layout_data in batch_data.layouts:
-        # 위젯 ID는 layout.i 에서 가져옴 (예: "widget_1" -> 1)
-        try:
-            # "widget_123" 형식에서 숫자 추출
-            if layout_data.i.startswith("widget_"):
-                widget_id = int(layout_data.i.replace("widget_", ""))
-            else:
-                # 숫자만 있는 경우
-                widget_id = int(layout_data.i)
-        except ValueError:
-            # 변환 실패한 ID는 건너뜀
-            continue
-
-        # 위젯 조회 및 소유권 검증
-        widget = db.query(Widget).filter(
-            Widget.id == widget_id,
-            Widget.user_id == current_user.id
-        ).first()
-
-        if widget:
-            # 레이아웃 업데이트
-            widget.layout = json.dumps(layout_data.model_dump())
-            updated_widgets.append(widget)
-
-    if not updated_widgets:
+        widget_id = _parse_layout_widget_id(layout_data.i)
+        if widget_id is not None:
+            layouts[widget_id] = layout_data.model_dump()
+
+    if not layouts:
         return []  # 에러 대신 빈 배열 반환
 
+    # 소유한 위젯만 한 번에 조회 (응답에 필요한 컬럼만)
+    rows = (await db.execute(
+        select(
+            Widget.id, Widget.user_id, Widget.name, Widget.type, Widget.config, Widget.created_at
+        ).where(Widget.id.in_(layouts.keys()), Widget.user_id == current_user.id)
+    )).all()
+    owned = {row.id: row for row in rows}
+    if not owned:
+        return []
+
+    # updated_at을 직접 지정해 갱신 후 재조회 없이 응답 구성
+    updated_at = _now_utc()
+    widget_ids = [widget_id for widget_id in layouts if widget_id in owned]
+
     try:
-        db.commit()
-        # 업데이트된 위젯 재조회
-        for widget in updated_widgets:
-            db.refresh(widget)
-        return [serialize_widget(widget) for widget in updated_widgets]
+        # 같은 위젯의 이전 대기 레이아웃은 덮어써짐 (write-through 모드에서는 여기서 바로 저장)
+        await _submit_user_layouts(
+            current_user.id,
+            {widget_id: (layouts[widget_id], updated_at) for widget_id in widget_ids},
+        )
     except Exception as e:
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update layouts: {str(e)}"
         )
 
+    return [
+        WidgetResponse(
+            id=widget_id,
+            user_id=owned[widget_id].user_id,
+            name=owned[widget_id].name,
+            type=owned[widget_id].type,
+            config=owned[widget_id].config,
+            layout=layouts[widget_id],
+            created_at=owned[widget_id].created_at,
+            updated_at=updated_at
+        )
+        for widget_id in widget_ids
+    ]
+
 
 @router.delete("/all", status_code=status.HTTP_204_NO_CONTENT)
-def delete_all_widgets(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def delete_all_widgets(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     현재 사용자의 모든 위젯을 삭제합니다.
@@ -149,12 +293,15 @@ def delete_all_widgets(
     - 인증 필요
     - 현재 사용자 소유의 모든 위젯 삭제
     """
+    # 삭제될 위젯의 대기 중인 레이아웃은 버림
+    await _discard_user_layouts(current_user.id)
+
     try:
-        db.query(Widget).filter(Widget.user_id == current_user.id).delete()
-        db.commit()
+        await db.execute(delete(Widget).where(Widget.user_id == current_user.id))
+        await db.commit()
         return None
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete all widgets: {str(e)}"
@@ -162,11 +309,11 @@ def delete_all_widgets(
 
 
 @router.put("/{widget_id}", response_model=WidgetResponse)
-def update_widget(
+async def update_widget(
     widget_id: int,
     widget_data: WidgetUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     위젯을 업데이트합니다.
@@ -176,7 +323,7 @@ def update_widget(
     - 제공된 필드만 업데이트
     """
     # 위젯 조회
-    widget = db.query(Widget).filter(Widget.id == widget_id).first()
+    widget = await db.get(Widget, widget_id)
 
     if not widget:
         raise HTTPException(
@@ -191,22 +338,31 @@ def update_widget(
             detail="Not authorized to update this widget"
         )
 
+    # 명시적 레이아웃 수정은 버퍼의 이전 레이아웃보다 우선, 아니면 버퍼를 먼저 저장
+    if widget_data.layout is not None:
+        await _discard_user_layouts(current_user.id, [widget_id])
+    elif not _layout_buffer.is_idle(current_user.id):
+        await _flush_user_layouts(current_user.id)
+        await db.refresh(widget)
+
     # 필드 업데이트 (제공된 값만)
     if widget_data.name is not None:
         widget.name = widget_data.name
     if widget_data.type is not None:
         widget.type = widget_data.type
     if widget_data.config is not None:
-        widget.config = json.dumps(widget_data.config)
+        widget.config = widget_data.config
     if widget_data.layout is not None:
-        widget.layout = json.dumps(widget_data.layout.model_dump())
+        widget.layout = widget_data.layout.model_dump()
+    # 초 단위 DB 기본값 대신 직접 지정 (같은 초 안의 수정도 ETag가 바뀌도록)
+    widget.updated_at = _now_utc()
 
     try:
-        db.commit()
-        db.refresh(widget)
+        # expire_on_commit=False라 커밋 후 재조회 없이 응답 구성
+        await db.commit()
         return serialize_widget(widget)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update widget: {str(e)}"
@@ -214,10 +370,10 @@ def update_widget(
 
 
 @router.delete("/{widget_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_widget(
+async def delete_widget(
     widget_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     위젯을 삭제합니다.
@@ -226,7 +382,7 @@ def delete_widget(
     - 소유권 검증 (다른 사용자의 위젯 삭제 불가)
     """
     # 위젯 조회
-    widget = db.query(Widget).filter(Widget.id == widget_id).first()
+    widget = await db.get(Widget, widget_id)
 
     if not widget:
         raise HTTPException(
@@ -241,12 +397,14 @@ def delete_widget(
             detail="Not authorized to delete this widget"
         )
 
+    await _discard_user_layouts(current_user.id, [widget_id])
+
     try:
-        db.delete(widget)
-        db.commit()
+        await db.delete(widget)
+        await db.commit()
         return None
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete widget: {str(e)}"
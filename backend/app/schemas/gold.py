@@ -0,0 +1,23 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+# 대시보드 위젯 타입 (Widget.type과 동일한 이름)
+GoldWidgetType = Literal["international_gold", "krx_gold", "kimchi_premium", "gold_recommendation"]
+
+
+class GoldBatchItem(BaseModel):
+    """배치 요청의 위젯 데이터 1건"""
+    type: GoldWidgetType = Field(..., description="Widget type")
+    period: str = Field(default="1d", pattern="^(1d|1w|1m|1y|3y|5y)$", description="Time period")
+    format: Literal["rows", "columnar"] = Field(
+        default="rows", description="international_gold/krx_gold only: rows or columnar"
+    )
+    max_points: Optional[int] = Field(
+        default=None, ge=10, le=5000, description="Downsampling limit (not used by gold_recommendation)"
+    )
+
+
+class GoldBatchRequest(BaseModel):
+    """여러 위젯 데이터 일괄 조회 요청"""
+    items: list[GoldBatchItem] = Field(..., min_length=1, max_length=32, description="Widget data to load")
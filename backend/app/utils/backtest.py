@@ -0,0 +1,67 @@
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+# Position taken after each signal; "hold" keeps the previous one
+_POSITIONS = {"buy": 1.0, "sell": 0.0}
+
+
+def backtest_signals(close: np.ndarray, signals: np.ndarray, horizon: int = 1) -> Dict[str, Any]:
+    """
+    Evaluate a daily signal history against the closes it was computed from, in one vectorized pass.
+
+    - Hit: a buy followed by a higher close `horizon` bars later, or a sell
+      followed by a lower one. Signals without a close `horizon` bars later are
+      not scored.
+    - Equity: long one unit after a buy, flat after a sell, unchanged on hold.
+      The position taken at close t earns the return from t to t+1. Starts at 1.0.
+
+    Args:
+        close: Closing prices, oldest first
+        signals: "buy" / "sell" / "hold" per close
+        horizon: Bars ahead used to score a signal
+
+    Returns:
+        Dict with equity, benchmark (buy and hold) and hit (True/False/None) arrays
+        plus summary figures
+    """
+    close = np.asarray(close, dtype=float)
+    signals = np.asarray(signals)
+    n = len(close)
+
+    forward = np.full(n, np.nan)
+    if n > horizon:
+        forward[:-horizon] = close[horizon:] / close[:-horizon] - 1
+    is_buy, is_sell = signals == "buy", signals == "sell"
+    scored = (is_buy | is_sell) & ~np.isnan(forward)
+    hit = (is_buy & (forward > 0)) | (is_sell & (forward < 0))
+
+    position = pd.Series(signals).map(_POSITIONS).ffill().fillna(0.0).to_numpy()
+    daily_return = np.zeros(n)
+    daily_return[1:] = close[1:] / close[:-1] - 1
+    strategy_return = np.zeros(n)
+    strategy_return[1:] = position[:-1] * daily_return[1:]
+    equity = np.cumprod(1 + strategy_return)
+    benchmark = close / close[0] if n else close
+    drawdown = equity / np.maximum.accumulate(equity) - 1 if n else equity
+
+    scored_count = int(scored.sum())
+    return {
+        "equity": equity,
+        "benchmark": benchmark,
+        "hit": np.where(scored, hit, None),
+        "summary": {
+            "days": n,
+            "buy_days": int(is_buy.sum()),
+            "sell_days": int(is_sell.sum()),
+            "hold_days": int(n - is_buy.sum() - is_sell.sum()),
+            "scored_signals": scored_count,
+            "hits": int((hit & scored).sum()),
+            "hit_rate": float((hit & scored).sum() / scored_count) if scored_count else None,
+            "total_return_pct": float((equity[-1] - 1) * 100) if n else 0.0,
+            "buy_and_hold_return_pct": float((benchmark[-1] - 1) * 100) if n else 0.0,
+            "max_drawdown_pct": float(drawdown.min() * 100) if n else 0.0,
+            "exposure_pct": float(position.mean() * 100) if n else 0.0,
+        },
+    }
@@ -0,0 +1,65 @@
+from datetime import date
+from typing import Callable
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.price_bar import PriceBar
+from app.utils.timeseries import OHLCV_COLUMNS
+
+_VALUE_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class SqlBarStore:
+    """
+    Persists daily OHLCV bars in the `price_bars` table, keyed by (symbol, date).
+
+    Used by SeriesStore to warm symbols on startup and to save newly fetched
+    bars, so a restart only downloads bars newer than the stored ones and the
+    last known history stays available when upstream is unreachable.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self._session_factory = session_factory
+
+    def load(self, symbol: str, since: date) -> pd.DataFrame:
+        """Return stored bars of `symbol` from `since` onward as an OHLCV frame indexed by date."""
+        stmt = (
+            select(PriceBar.date, PriceBar.open, PriceBar.high, PriceBar.low, PriceBar.close, PriceBar.volume)
+            .where(PriceBar.symbol == symbol, PriceBar.date >= since)
+            .order_by(PriceBar.date)
+        )
+        with self._session_factory() as db:
+            rows = db.execute(stmt).all()
+        frame = pd.DataFrame(rows, columns=["date"] + OHLCV_COLUMNS)
+        frame.index = pd.DatetimeIndex(pd.to_datetime(frame.pop("date")))
+        return frame
+
+    def save(self, symbol: str, frame: pd.DataFrame) -> None:
+        """Insert or overwrite the given bars in one statement."""
+        if frame.empty:
+            return
+        values = frame[OHLCV_COLUMNS].copy()
+        values.columns = _VALUE_COLUMNS
+        values["volume"] = values["volume"].fillna(0).astype("int64")
+        values["symbol"] = symbol
+        values["date"] = frame.index.date
+        rows = values.to_dict("records")
+
+        with self._session_factory() as db:
+            dialect = db.get_bind().dialect.name
+            if dialect in ("sqlite", "postgresql"):
+                insert = sqlite_insert if dialect == "sqlite" else pg_insert
+                stmt = insert(PriceBar)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[PriceBar.symbol, PriceBar.date],
+                    set_={col: stmt.excluded[col] for col in _VALUE_COLUMNS},
+                )
+                db.execute(stmt, rows)
+            else:
+                for row in rows:
+                    db.merge(PriceBar(**row))
+            db.commit()
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Expiring(NamedTuple):
+    """
+    Loader result that carries its own lifetime: aget_or_set() stores `value`
+    for at most `ttl` seconds (e.g. the time left on a value read from a
+    shared cache) instead of the full ttl it was called with.
+    """
+    value: Any
+    ttl: float
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    stale_until: float
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache with per-entry TTL.
+
+    - aget_or_set() loads a missing key once (single-flight): one load task per
+      key is shared by every awaiting caller instead of calling the loader again.
+    - An expired entry is still served for `stale_ttl` seconds while a single
+      background task refreshes it (stale-while-revalidate).
+    - Counters are exposed through stats().
+    """
+
+    def __init__(self, maxsize: int = 256, stale_ttl: float = 0.0):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._load_errors = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value if it has not expired, otherwise None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.expires_at:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry.value
+            self._misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any, ttl: float, stale_ttl: Optional[float] = None) -> None:
+        """Store a value for `ttl` seconds, evicting the least recently used entries if full."""
+        if stale_ttl is None:
+            stale_ttl = self.stale_ttl
+        now = time.monotonic()
+        entry = _Entry(value=value, expires_at=now + ttl, stale_until=now + ttl + stale_ttl)
+        with self._lock:
+            if key not in self._entries:
+                self._purge_expired(now)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    async def aget_or_set(
+        self,
+        key: Hashable,
+        ttl: float,
+        loader: Callable[[], Awaitable[Any]],
+        stale_ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        Return the cached value for `key`, awaiting `loader()` at most once on a miss.
+
+        The load runs as its own task, so a caller that is cancelled (e.g. the
+        client disconnected) does not abort the load for the other waiters.
+
+        Args:
+            key: Cache key
+            ttl: Seconds the loaded value stays fresh
+            loader: Zero-argument coroutine function producing the value (or an
+                Expiring); exceptions propagate and nothing is cached
+            stale_ttl: Seconds an expired value may still be served while it is
+                refreshed in the background (defaults to the cache-wide setting)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        if stale_ttl is None:
+            stale_ttl = self.stale_ttl
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now < entry.expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry.value
+                if now < entry.stale_until:
+                    self._entries.move_to_end(key)
+                    self._stale_hits += 1
+                    if key not in self._inflight:
+                        self._start_load(key, ttl, stale_ttl, loader)
+                    return entry.value
+            self._misses += 1
+            task = self._inflight.get(key) or self._start_load(key, ttl, stale_ttl, loader)
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single key."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            lookups = self._hits + self._stale_hits + self._misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "loads": self._loads,
+                "load_errors": self._load_errors,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "refreshing": len(self._inflight),
+                "hit_rate": round((self._hits + self._stale_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _start_load(
+        self, key: Hashable, ttl: float, stale_ttl: float, loader: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        # Caller holds self._lock
+        task = asyncio.get_running_loop().create_task(self._aload(key, ttl, stale_ttl, loader))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._finish_load(key, t))
+        return task
+
+    async def _aload(
+        self, key: Hashable, ttl: float, stale_ttl: float, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        try:
+            value = await loader()
+        except Exception:
+            with self._lock:
+                self._load_errors += 1
+            raise
+        with self._lock:
+            self._loads += 1
+        if isinstance(value, Expiring):
+            value, ttl = value.value, min(ttl, value.ttl)
+        self.set(key, value, ttl, stale_ttl)
+        return value
+
+    def _finish_load(self, key: Hashable, task: asyncio.Task) -> None:
+        with self._lock:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None and key in self._entries:
+            # Background refresh of a stale entry failed; keep serving the stale value
+            logger.warning("Background refresh failed for cache key %r", key, exc_info=task.exception())
+
+    def _purge_expired(self, now: float) -> None:
+        # Caller holds self._lock
+        expired = [k for k, e in self._entries.items() if now >= e.stale_until]
+        for k in expired:
+            del self._entries[k]
+            self._expirations += 1
+
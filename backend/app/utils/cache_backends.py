@@ -0,0 +1,378 @@
+import asyncio
+import logging
+import os
+import pickle
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.engine import make_url
+
+from app.utils.cache import Expiring
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """
+    Key/value store with per-key expiry, shared by everything that uses the same backend.
+
+    get/set/add/delete are blocking calls; cross-process backends store values
+    pickled, so only trusted processes (the app's own workers) may write to them.
+    """
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Value of an unexpired key, otherwise None."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Store only if the key is missing or expired; True if stored (usable as a lock)."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def delete_if(self, key: str, value: Any) -> bool:
+        """Delete the key only if it currently holds `value` (compare-and-delete); True if deleted."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """In-process backend: shared by the threads and tasks of one worker only."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                return None
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            now = time.time()
+            if key not in self._entries:
+                for k in [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]:
+                    del self._entries[k]
+            self._entries[key] = (value, now + ttl)
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                return False
+            self._entries[key] = (value, time.time() + ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_if(self, key: str, value: Any) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time() or entry[0] != value:
+                return False
+            del self._entries[key]
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": self.name, "size": len(self._entries)}
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    SQLite-file backend shared by every process on the host that opens the same file.
+
+    WAL mode lets readers proceed while a worker writes; each thread uses its
+    own autocommit connection (every statement is atomic on its own). Expired
+    rows are purged periodically on writes. close() closes the connections of
+    all threads.
+    """
+
+    name = "sqlite"
+    PURGE_EVERY = 100
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._writes = 0
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return None if row is None else pickle.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._conn().execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, blob, time.time() + ttl),
+        )
+        self._maybe_purge()
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        cursor = self._conn().execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE cache_entries.expires_at <= ?",
+            (key, blob, now + ttl, now),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, key: str) -> None:
+        self._conn().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def delete_if(self, key: str, value: Any) -> bool:
+        # Equal values pickle to equal bytes for the simple lock tokens this is used with
+        cursor = self._conn().execute(
+            "DELETE FROM cache_entries WHERE key = ? AND value = ? AND expires_at > ?",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def stats(self) -> Dict[str, Any]:
+        size = self._conn().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        return {"backend": self.name, "path": self.path, "size": size}
+
+    def close(self) -> None:
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            # Threads that use the backend again afterwards open new connections
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            with self._connections_lock:
+                self._connections.append(conn)
+                self._local.conn = conn
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        # check_same_thread=False only so close() can close other threads' connections;
+        # each connection is still used by the thread that opened it
+        conn = sqlite3.connect(
+            self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None, check_same_thread=False
+        )
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError:
+            # Another worker is switching the file to WAL right now (the mode is persistent)
+            pass
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _maybe_purge(self) -> None:
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY:
+            return
+        self._conn().execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+
+
+class RedisBackend(CacheBackend):
+    """
+    Backend for any server speaking the Redis protocol (Redis, Valkey, KeyDB, ...).
+
+    Requires the optional `redis` package. Keys are prefixed so several apps can
+    share one server.
+    """
+
+    name = "redis"
+
+    # Compare-and-delete in one round trip (plain GET + DEL could delete a key another process just set)
+    DELETE_IF_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+    )
+
+    def __init__(self, url: str, prefix: str = "module43:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RedisBackend requires the 'redis' package (pip install redis)") from e
+        self.url = url
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._delete_if = self._client.register_script(self.DELETE_IF_SCRIPT)
+
+    def get(self, key: str) -> Optional[Any]:
+        blob = self._client.get(self.prefix + key)
+        return None if blob is None else pickle.loads(blob)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._client.set(self.prefix + key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=_millis(ttl))
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        return bool(self._client.set(
+            self.prefix + key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=_millis(ttl), nx=True
+        ))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def delete_if(self, key: str, value: Any) -> bool:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return bool(self._delete_if(keys=[self.prefix + key], args=[blob]))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "url": make_url(self.url).render_as_string(hide_password=True)}
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def _millis(seconds: float) -> int:
+    return max(1, int(seconds * 1000))
+
+
+def create_cache_backend(url: str) -> CacheBackend:
+    """
+    Build a backend from a URL.
+
+    - memory://                    per-process (default, single worker)
+    - sqlite:///path/to/cache.db   shared by all workers on the host
+    - redis://host:6379/0          shared through a Redis-protocol server
+
+    Raises:
+        ValueError: Unknown scheme or missing SQLite path
+    """
+    scheme = url.split("://", 1)[0].lower()
+    if scheme == "memory":
+        return MemoryBackend()
+    if scheme == "sqlite":
+        path = make_url(url).database
+        if not path or path == ":memory:":
+            raise ValueError("The sqlite cache backend needs a file path, e.g. sqlite:///./gold_cache.db")
+        return SQLiteBackend(path)
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+    raise ValueError(f"Unknown cache backend URL scheme '{scheme}'")
+
+
+class SharedCache:
+    """
+    Cross-process single-flight loads on top of a CacheBackend.
+
+    aget_or_load() returns the backend's value for a key or, on a miss, lets
+    exactly one process load it: the first caller takes a lock key with add(),
+    loads and stores the value; callers in other workers poll the backend
+    until the value appears (or the wait times out, then they load themselves).
+    The lock holds a random owner token and is released with delete_if(), so a
+    caller never removes a lock another process holds. Backend errors degrade
+    to loading locally.
+
+    Values are stored with their expiry time, so aget_or_load_expiring() can
+    report how long a value has left (callers caching it locally should not
+    keep it longer than that).
+    """
+
+    def __init__(self, backend: CacheBackend, lock_timeout: float = 30.0, poll_interval: float = 0.05):
+        self.backend = backend
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._hits = 0
+        self._loads = 0
+        self._waits = 0
+        self._errors = 0
+
+    async def aget_or_load(self, key: str, ttl: float, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the shared value of `key`, loading and storing it for `ttl` seconds on a miss.
+
+        Exceptions from `loader` propagate and nothing is stored.
+        """
+        return (await self.aget_or_load_expiring(key, ttl, loader)).value
+
+    async def aget_or_load_expiring(
+        self, key: str, ttl: float, loader: Callable[[], Awaitable[Any]]
+    ) -> Expiring:
+        """aget_or_load(), returning Expiring(value, seconds until the shared value expires)."""
+        cached = await self._get(key)
+        if cached is not None:
+            return cached
+
+        lock_key = f"{key}:lock"
+        token = f"{os.getpid()}:{secrets.token_hex(8)}"
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            acquired = await self._call(self.backend.add, lock_key, token, self.lock_timeout, default=True)
+            if acquired:
+                break
+            # Another worker is loading the key
+            self._waits += 1
+            await asyncio.sleep(self.poll_interval)
+            cached = await self._get(key)
+            if cached is not None:
+                return cached
+            if time.monotonic() >= deadline:
+                break
+
+        try:
+            value = await loader()
+            self._loads += 1
+            await self._call(self.backend.set, key, (time.time() + ttl, value), ttl)
+            return Expiring(value, ttl)
+        finally:
+            if acquired:
+                await self._call(self.backend.delete_if, lock_key, token)
+
+    async def _get(self, key: str) -> Optional[Expiring]:
+        entry = await self._call(self.backend.get, key)
+        if entry is None:
+            return None
+        self._hits += 1
+        expires_at, value = entry
+        return Expiring(value, max(0.0, expires_at - time.time()))
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            stats = self.backend.stats()
+        except Exception:
+            stats = {"backend": self.backend.name}
+        stats.update(hits=self._hits, loads=self._loads, waits=self._waits, errors=self._errors)
+        return stats
+
+    async def _call(self, func: Callable[..., Any], *args: Any, default: Any = None) -> Any:
+        if isinstance(self.backend, MemoryBackend):
+            return func(*args)
+        try:
+            return await asyncio.to_thread(func, *args)
+        except Exception:
+            self._errors += 1
+            logger.warning("Cache backend %s failed", self.backend.name, exc_info=True)
+            return default
+
@@ -0,0 +1,108 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Candle sizes tried from finest to coarsest: (pandas period alias, interval label)
+OHLC_BUCKETS = (("W", "1w"), ("M", "1mo"), ("Q", "3mo"), ("Y", "1y"))
+# Point counts a premium line is reduced to with LTTB (requests round down to one of these)
+LTTB_SIZES = (10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+def ohlc_bucket_sizes(index: pd.DatetimeIndex) -> Tuple[Tuple[str, str, int], ...]:
+    """
+    Number of candles per candle size, finest first, starting with daily bars.
+
+    Returns:
+        ((pandas period alias or "" for daily, interval label, candles), ...)
+    """
+    sizes = [("", "1d", len(index))]
+    for freq, label in OHLC_BUCKETS:
+        sizes.append((freq, label, index.to_period(freq).nunique() if len(index) else 0))
+    return tuple(sizes)
+
+
+def choose_ohlc_bucket(sizes: Sequence[Tuple[str, str, int]], max_points: int) -> Tuple[str, str]:
+    """
+    Pick the finest candle size from ohlc_bucket_sizes() that yields at most `max_points` candles.
+
+    Returns:
+        (pandas period alias or "" for daily, interval label)
+    """
+    for freq, label, count in sizes:
+        if count <= max_points:
+            return freq, label
+    return sizes[-1][0], sizes[-1][1]
+
+
+def lttb_size(max_points: int, length: int) -> Optional[int]:
+    """
+    LTTB threshold to use for a request of at most `max_points` points out of `length`.
+
+    Requests are rounded down to one of LTTB_SIZES, so results can be cached
+    per size instead of per requested number. None if no reduction is needed.
+    """
+    if max_points >= length:
+        return None
+    fitting = [size for size in LTTB_SIZES if size <= max_points]
+    return fitting[-1] if fitting else LTTB_SIZES[0]
+
+
+def resample_ohlc(frame: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """
+    Aggregate daily OHLCV bars into candles of period `freq` ("W", "M", ...).
+
+    Each candle is dated by its first trading day.
+    """
+    if not freq or frame.empty:
+        return frame
+    candles = frame.assign(first_day=frame.index).groupby(frame.index.to_period(freq), sort=True).agg(
+        first_day=("first_day", "first"),
+        Open=("Open", "first"),
+        High=("High", "max"),
+        Low=("Low", "min"),
+        Close=("Close", "last"),
+        Volume=("Volume", "sum"),
+    )
+    return candles.set_index("first_day").rename_axis(None)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling of a line.
+
+    Args:
+        x: Monotonic x values (e.g. day numbers)
+        y: y values
+        threshold: Number of points to keep (>= 3)
+
+    Returns:
+        Sorted indices of the points to keep, always including the first and last
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bucket boundaries for the n - 2 inner points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    prev = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point for the final bucket)
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Triangle area for every candidate in this bucket, computed at once
+        areas = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(areas))
+        selected[i + 1] = prev
+    return selected
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+
+def make_etag(data: bytes) -> str:
+    """Strong ETag (quoted hex digest) for a response body or version fingerprint."""
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value matches `etag` (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def cache_headers(etag: str, max_age: float) -> dict:
+    # Responses are per authenticated user: browsers may reuse them, shared caches may not
+    return {"ETag": etag, "Cache-Control": f"private, max-age={int(max_age)}"}
+
+
+def not_modified(request: Request, etag: str, max_age: float) -> Optional[Response]:
+    """Return a 304 response if the client already holds `etag`, otherwise None."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers(etag, max_age))
+    return None
+
+
+def render_json(payload: Any) -> bytes:
+    """Serialize like FastAPI's JSONResponse."""
+    return json.dumps(
+        payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class RenderedPayloads:
+    """
+    Remembers the serialized body and ETag of the last payload seen per key.
+
+    Cached payload objects are reused until their cache entry is replaced, so
+    the JSON body and its hash are computed once per new payload instead of
+    once per request. Since the ETag hashes the body, a refresh that produces
+    identical data keeps the same ETag.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[Any, bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, key: Hashable, payload: Any) -> Tuple[bytes, str]:
+        """Return (JSON body, strong ETag) for `payload`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is payload:
+                self._entries.move_to_end(key)
+                return entry[1], entry[2]
+        body = render_json(payload)
+        etag = make_etag(body)
+        with self._lock:
+            self._entries[key] = (payload, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return body, etag
+
+    def respond(self, request: Request, key: Hashable, payload: Any, max_age: float) -> Response:
+        """JSON response for `payload` with ETag/Cache-Control, or 304 if the client's copy is current."""
+        body, etag = self.render(key, payload)
+        return not_modified(request, etag, max_age) or Response(
+            content=body, media_type="application/json", headers=cache_headers(etag, max_age)
+        )
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without contacting the host while its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream host.
+
+    After `failure_threshold` failures in a row the circuit opens and calls fail
+    fast for `reset_timeout` seconds; then a single trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == "open" or (state == "half-open" and self._trial_in_flight):
+            raise CircuitOpenError("Circuit open for upstream host")
+        if state == "half-open":
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_cancelled(self) -> None:
+        # A cancelled call says nothing about the host's health
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.failures >= self.failure_threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+
+class UpstreamClient:
+    """
+    Shared async HTTP client for upstream data providers.
+
+    Wraps one long-lived httpx.AsyncClient (keep-alive pooling, HTTP/2 when the
+    `h2` package is installed), caps concurrent requests with a semaphore and
+    keeps a circuit breaker per host.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        concurrency: int = 10,
+        http2: bool = True,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self._client = httpx.AsyncClient(
+            transport=transport,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            http2=http2 and _HTTP2_AVAILABLE,
+        )
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a GET request through the pool.
+
+        Transport errors and 5xx responses count as failures for the host's
+        circuit breaker; 5xx responses are raised as httpx.HTTPStatusError.
+
+        Raises:
+            CircuitOpenError: The host's circuit is open
+            httpx.HTTPError: Request failed
+        """
+        host = httpx.URL(url).host
+        breaker = self._breakers.setdefault(
+            host, CircuitBreaker(self._failure_threshold, self._reset_timeout)
+        )
+        breaker.before_call()
+        try:
+            async with self._semaphore:
+                response = await self._client.get(url, **kwargs)
+            if response.status_code >= 500:
+                response.raise_for_status()
+        except httpx.HTTPError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.record_cancelled()
+            raise
+        breaker.record_success()
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            host: {"state": breaker.state, "failures": breaker.failures}
+            for host, breaker in self._breakers.items()
+        }
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_client: Optional[UpstreamClient] = None
+
+
+async def open_upstream_client() -> UpstreamClient:
+    """Create the shared client (called from the app lifespan)."""
+    global _client
+    if _client is None:
+        _client = UpstreamClient(
+            timeout=float(os.getenv("UPSTREAM_TIMEOUT", "10")),
+            max_connections=int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "20")),
+            concurrency=int(os.getenv("UPSTREAM_CONCURRENCY", "10")),
+            http2=os.getenv("UPSTREAM_HTTP2", "true").lower() not in ("0", "false", "no"),
+        )
+    return _client
+
+
+async def close_upstream_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_upstream_client() -> UpstreamClient:
+    """
+    Return the shared client.
+
+    Raises:
+        RuntimeError: The client has not been opened by the app lifespan
+    """
+    if _client is None:
+        raise RuntimeError("Upstream client is not running")
+    return _client
@@ -0,0 +1,463 @@
+import copy
+import json
+import math
+import operator
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+Columns = Dict[str, np.ndarray]
+
+
+def _seeded_ewm(values: np.ndarray, n: int, alpha: float) -> np.ndarray:
+    """
+    Exponential smoothing seeded with the mean of the first `n` values, NaN before it.
+
+    Vectorized equivalent of the running-mean-then-smooth updates used by EMA,
+    RSI and ATR below.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) < n:
+        return out
+    seeded = values[n - 1:].astype(float)
+    seeded[0] = values[:n].mean()
+    out[n - 1:] = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+
+class Indicator:
+    """
+    A streaming indicator: update() consumes one bar in O(1), outputs() reads the current values.
+
+    compute() evaluates the same indicator over whole columns at once (for backtests).
+    """
+
+    def update(self, high: float, low: float, close: float) -> None:
+        raise NotImplementedError
+
+    def outputs(self) -> Dict[str, Optional[float]]:
+        """Current values keyed by output suffix ("" for single-output indicators); None until warmed up."""
+        raise NotImplementedError
+
+    def compute(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Columns:
+        """Value at every bar keyed like outputs(); NaN until warmed up."""
+        raise NotImplementedError
+
+
+class SMA(Indicator):
+    """Simple moving average over the last `window` closes (running sum)."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values: deque = deque(maxlen=window)
+        self._sum = 0.0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        if len(self._values) == self.window:
+            self._sum -= self._values[0]
+        self._values.append(close)
+        self._sum += close
+
+    def outputs(self) -> Dict[str, Optional[float]]:
+        return {"": self._sum / self.window if len(self._values) == self.window else None}
+
+    def compute(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Columns:
+        return {"": pd.Series(close).rolling(self.window).mean().to_numpy()}
+
+
+class EMA(Indicator):
+    """Exponential moving average with alpha = 2 / (span + 1), seeded with the SMA of the first `span` closes."""
+
+    def __init__(self, span: int):
+        self.span = span
+        self.alpha = 2.0 / (span + 1)
+        self._count = 0
+        self._value = 0.0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        self._count += 1
+        if self._count <= self.span:
+            self._value += (close - self._value) / self._count  # running mean as the seed
+        else:
+            self._value += self.alpha * (close - self._value)
+
+    def outputs(self) -> Dict[str, Optional[float]]:
+        return {"": self._value if self._count >= self.span else None}
+
+    def compute(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Columns:
+        return {"": _seeded_ewm(close, self.span, self.alpha)}
+
+
+class RSI(Indicator):
+    """Relative Strength Index with Wilder smoothing."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._prev_close: Optional[float] = None
+        self._count = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        if self._prev_close is None:
+            self._prev_close = close
+            return
+        change = close - self._prev_close
+        self._prev_close = close
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        self._count += 1
+        if self._count <= self.period:
+            self._avg_gain += (gain - self._avg_gain) / self._count
+            self._avg_loss += (loss - self._avg_loss) / self._count
+        else:
+            self._avg_gain += (gain - self._avg_gain) / self.period
+            self._avg_loss += (loss - self._avg_loss) / self.period
+
+    def outputs(self) -> Dict[str, Optional[float]]:
+        if self._count < self.period:
+            return {"": None}
+        if self._avg_loss == 0:
+            return {"": 100.0 if self._avg_gain > 0 else 50.0}
+        return {"": 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)}
+
+    def compute(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Columns:
+        change = np.diff(close)
+        avg_gain = np.concatenate(([np.nan], _seeded_ewm(np.maximum(change, 0.0), self.period, 1.0 / self.period)))
+        avg_loss = np.concatenate(([np.nan], _seeded_ewm(np.maximum(-change, 0.0), self.period, 1.0 / self.period)))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        flat = avg_loss == 0
+        rsi[flat] = np.where(avg_gain[flat] > 0, 100.0, 50.0)
+        return {"": rsi}
+
+
+class Bollinger(Indicator):
+    """Bollinger bands: SMA of `window` closes +/- k population standard deviations."""
+
+    def __init__(self, window: int = 20, k: float = 2.0):
+        self.window = window
+        self.k = k
+        self._values: deque = deque(maxlen=window)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        if len(self._values) == self.window:
+            oldest = self._values[0]
+            self._sum -= oldest
+            self._sum_sq -= oldest * oldest
+        self._values.append(close)
+        self._sum += close
+        self._sum_sq += close * close
+
+    def outputs(self) -> Dict[str, Optional[float]]:
+        if len(self._values) < self.window:
+            return {"mid": None, "upper": None, "lower": None}
+        mean = self._sum / self.window
+        std = math.sqrt(max(self._sum_sq / self.window - mean * mean, 0.0))
+        return {"mid": mean, "upper": mean + self.k * std, "lower": mean - self.k * std}
+
+    def compute(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Columns:
+        rolling = pd.Series(close).rolling(self.window)
+        mean = rolling.mean().to_numpy()
+        std = rolling.std(ddof=0).to_numpy()
+        return {"mid": mean, "upper": mean + self.k * std, "lower": mean - self.k * std}
+
+
+class ATR(Indicator):
+    """Average True Range with Wilder smoothing."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._prev_close: Optional[float] = None
+        self._count = 0
+        self._value = 0.0
+
+    def update(self, high: float, low: float, close: float) -> None:
+        if self._prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self._count += 1
+        if self._count <= self.period:
+            self._value += (true_range - self._value) / self._count
+        else:
+            self._value += (true_range - self._value) / self.period
+
+    def outputs(self) -> Dict[str, Optional[float]]:
+        return {"": self._value if self._count >= self.period else None}
+
+    def compute(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Columns:
+        prev_close = np.concatenate(([np.nan], close[:-1]))
+        with np.errstate(invalid="ignore"):
+            true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        return {"": _seeded_ewm(true_range, self.period, 1.0 / self.period)}
+
+
+DEFAULT_INDICATORS: Dict[str, Callable[[], Indicator]] = {
+    "sma5": lambda: SMA(5),
+    "sma20": lambda: SMA(20),
+    "ema12": lambda: EMA(12),
+    "ema26": lambda: EMA(26),
+    "rsi14": lambda: RSI(14),
+    "bb20": lambda: Bollinger(20, 2.0),
+    "atr14": lambda: ATR(14),
+}
+
+
+def indicator_columns(
+    frame: pd.DataFrame,
+    factories: Mapping[str, Callable[[], Indicator]] = DEFAULT_INDICATORS,
+) -> Columns:
+    """
+    Every indicator output for every bar of a date-sorted OHLC frame, named like
+    IndicatorEngine.snapshot() (close, prev_close, sma5, bb20_upper, ...).
+
+    Bars without a close are expected to be dropped by the caller.
+    """
+    close = frame["Close"].to_numpy(dtype=float)
+    high = np.where(np.isnan(frame["High"].to_numpy(dtype=float)), close, frame["High"].to_numpy(dtype=float))
+    low = np.where(np.isnan(frame["Low"].to_numpy(dtype=float)), close, frame["Low"].to_numpy(dtype=float))
+    columns: Columns = {"close": close, "prev_close": np.concatenate(([np.nan], close[:-1]))}
+    for name, factory in factories.items():
+        for suffix, values in factory().compute(high, low, close).items():
+            columns[f"{name}_{suffix}" if suffix else name] = values
+    return columns
+
+
+class IndicatorEngine:
+    """
+    Keeps a set of streaming indicators for one daily bar series.
+
+    sync(frame) feeds only the bars after the last processed one, so keeping
+    the indicators current costs O(1) per new bar. The last bar may still
+    change intraday: the state from before it is checkpointed and a revised
+    bar for the same date replaces it instead of being counted twice.
+    """
+
+    def __init__(self, factories: Mapping[str, Callable[[], Indicator]] = DEFAULT_INDICATORS):
+        self.factories = dict(factories)
+        self.reset()
+
+    def reset(self) -> None:
+        self._state = self._fresh_state()
+        self._checkpoint: Optional[Dict[str, Any]] = None
+        self.last_date: Optional[pd.Timestamp] = None
+        self.bars = 0
+
+    def sync(self, frame: pd.DataFrame) -> int:
+        """
+        Consume the bars of a date-sorted OHLC frame that are newer than (or revise) the last processed bar.
+
+        A frame that does not reach back to the last processed bar (history gap)
+        rebuilds the state from scratch.
+
+        Returns:
+            Number of bars applied
+        """
+        if frame.empty:
+            return 0
+        index = frame.index
+        if self.last_date is None or index[0] > self.last_date:
+            self.reset()
+            start = 0
+        else:
+            start = int(index.searchsorted(self.last_date))
+            if start < len(index) and index[start] == self.last_date:
+                # The last processed bar is in the frame again: re-apply it on top of its checkpoint
+                self._restore_checkpoint()
+        if start >= len(index):
+            return 0
+
+        highs = frame["High"].to_numpy(dtype=float)[start:]
+        lows = frame["Low"].to_numpy(dtype=float)[start:]
+        closes = frame["Close"].to_numpy(dtype=float)[start:]
+        last = len(closes) - 1
+        for i in range(len(closes)):
+            if i == last:
+                self._checkpoint = copy.deepcopy(self._state)
+            self._apply(highs[i], lows[i], closes[i])
+        self.last_date = index[-1]
+        return len(closes)
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Current value of every indicator output plus close / prev_close."""
+        values: Dict[str, Optional[float]] = {
+            "close": self._state["close"],
+            "prev_close": self._state["prev_close"],
+        }
+        for name, indicator in self._state["indicators"].items():
+            for suffix, value in indicator.outputs().items():
+                values[f"{name}_{suffix}" if suffix else name] = value
+        return values
+
+    def _fresh_state(self) -> Dict[str, Any]:
+        return {
+            "indicators": {name: factory() for name, factory in self.factories.items()},
+            "close": None,
+            "prev_close": None,
+            "bars": 0,
+        }
+
+    def _restore_checkpoint(self) -> None:
+        if self._checkpoint is not None:
+            self._state = self._checkpoint
+            self._checkpoint = None
+
+    def _apply(self, high: float, low: float, close: float) -> None:
+        if np.isnan(close):
+            return
+        high = close if np.isnan(high) else high
+        low = close if np.isnan(low) else low
+        for indicator in self._state["indicators"].values():
+            indicator.update(high, low, close)
+        self._state["prev_close"] = self._state["close"]
+        self._state["close"] = close
+        self._state["bars"] += 1
+        self.bars = self._state["bars"]
+
+
+_OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+@dataclass(frozen=True)
+class Condition:
+    """`left op right` where each side is an indicator/input name or a number."""
+    left: Union[str, float]
+    op: str
+    right: Union[str, float]
+
+    def evaluate(self, values: Mapping[str, Optional[float]]) -> Optional[bool]:
+        """True/False, or None if an operand is missing or not warmed up."""
+        left, right = self._operand(self.left, values), self._operand(self.right, values)
+        if left is None or right is None:
+            return None
+        return _OPERATORS[self.op](left, right)
+
+    def evaluate_columns(self, columns: Mapping[str, np.ndarray], length: int) -> np.ndarray:
+        """Boolean column; False where an operand is missing or NaN."""
+        left, right = self._column(self.left, columns), self._column(self.right, columns)
+        if left is None or right is None:
+            return np.zeros(length, dtype=bool)
+        # Comparisons with NaN are False, like the None case of evaluate()
+        return np.broadcast_to(_OPERATORS[self.op](left, right), (length,))
+
+    def describe(self, values: Mapping[str, Optional[float]]) -> str:
+        """Human-readable form with the current operand values, e.g. "sma5 (2034.12) > sma20 (2011.40)"."""
+        def side(operand: Union[str, float]) -> str:
+            if not isinstance(operand, str):
+                return f"{operand:g}"
+            value = values.get(operand)
+            return operand if value is None else f"{operand} ({value:.2f})"
+        return f"{side(self.left)} {self.op} {side(self.right)}"
+
+    @staticmethod
+    def _operand(operand: Union[str, float], values: Mapping[str, Optional[float]]) -> Optional[float]:
+        return values.get(operand) if isinstance(operand, str) else float(operand)
+
+    @staticmethod
+    def _column(operand: Union[str, float], columns: Mapping[str, np.ndarray]) -> Optional[Union[np.ndarray, float]]:
+        return columns.get(operand) if isinstance(operand, str) else float(operand)
+
+
+def _is_finite(number: Union[int, float]) -> bool:
+    # JSON allows NaN/Infinity and integers too large for a float; neither can be compared or rendered
+    try:
+        return math.isfinite(number)
+    except OverflowError:
+        return False
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """
+    Buy when every `buy` condition holds, otherwise sell when any `sell`
+    condition holds, otherwise hold. Conditions that cannot be evaluated
+    count as not holding.
+    """
+    buy: Tuple[Condition, ...]
+    sell: Tuple[Condition, ...]
+
+    def evaluate(self, values: Mapping[str, Optional[float]]) -> str:
+        return self.explain(values)[0]
+
+    def explain(self, values: Mapping[str, Optional[float]]) -> Tuple[str, Tuple[Condition, ...]]:
+        """The signal and the conditions that decided it: every buy condition, the sell conditions that held, none for hold."""
+        if self.buy and all(c.evaluate(values) for c in self.buy):
+            return "buy", self.buy
+        fired = tuple(c for c in self.sell if c.evaluate(values))
+        if fired:
+            return "sell", fired
+        return "hold", ()
+
+    def evaluate_columns(self, columns: Mapping[str, np.ndarray], length: int) -> np.ndarray:
+        """evaluate() for every row of equally long columns at once; returns an array of signals."""
+        buy = np.zeros(length, dtype=bool)
+        if self.buy:
+            buy = np.logical_and.reduce([c.evaluate_columns(columns, length) for c in self.buy])
+        sell = np.zeros(length, dtype=bool)
+        if self.sell:
+            sell = np.logical_or.reduce([c.evaluate_columns(columns, length) for c in self.sell])
+        return np.where(buy, "buy", np.where(sell, "sell", "hold"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "buy": [[c.left, c.op, c.right] for c in self.buy],
+            "sell": [[c.left, c.op, c.right] for c in self.sell],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Iterable[Iterable[Any]]], names: Optional[Iterable[str]] = None) -> "RuleSet":
+        """
+        Build from {"buy": [[left, op, right], ...], "sell": [...]}.
+
+        Args:
+            data: Rule set as parsed from JSON
+            names: Operand names the rules may use (any name if None)
+
+        Raises:
+            ValueError: Malformed rule set or condition, unknown operator or operand name
+        """
+        if not isinstance(data, Mapping):
+            raise ValueError('Rule set must be an object like {"buy": [...], "sell": [...]}')
+        known = None if names is None else frozenset(names)
+
+        def conditions(key: str) -> Tuple[Condition, ...]:
+            items = data.get(key, ())
+            if isinstance(items, (str, bytes)) or not isinstance(items, Iterable):
+                raise ValueError(f"{key} rules must be a list of [left, op, right]")
+            parsed = []
+            for item in items:
+                try:
+                    left, op, right = item
+                except (TypeError, ValueError):
+                    raise ValueError(f"Malformed {key} rule {item!r}, expected [left, op, right]")
+                if not isinstance(op, str) or op not in _OPERATORS:
+                    raise ValueError(f"Unknown operator {op!r} in {key} rule")
+                if not all(isinstance(x, (str, int, float)) and not isinstance(x, bool) for x in (left, right)):
+                    raise ValueError(f"Rule operands must be names or numbers in {key} rule {item!r}")
+                if not all(isinstance(x, str) or _is_finite(x) for x in (left, right)):
+                    raise ValueError(f"Rule operands must be finite numbers in {key} rule {item!r}")
+                unknown = [x for x in (left, right) if isinstance(x, str) and known is not None and x not in known]
+                if unknown:
+                    raise ValueError(f"Unknown operand {unknown[0]!r} in {key} rule, expected one of {sorted(known)}")
+                parsed.append(Condition(left, op, right))
+            return tuple(parsed)
+        return cls(buy=conditions("buy"), sell=conditions("sell"))
+
+    @classmethod
+    def from_file(cls, path: str, names: Optional[Iterable[str]] = None) -> "RuleSet":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), names)
+
+
+# MA5/MA20 crossover gated by the kimchi premium (3% / 5%)
+DEFAULT_RULES = RuleSet.from_dict({
+    "buy": [["sma5", ">", "sma20"], ["premium_pct", "<", 3]],
+    "sell": [["sma5", "<", "sma20"], ["premium_pct", ">", 5]],
+})
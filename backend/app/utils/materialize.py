@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Mapping, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# on_change(previous, current) is called after a node's value changed (previous is None at first)
+ChangeListener = Callable[[Optional[Any], Any], None]
+
+
+@dataclass
+class _Node:
+    compute: Callable[[], Awaitable[Any]]
+    inputs: Tuple[str, ...]
+    on_change: Optional[ChangeListener]
+
+
+class Materializer:
+    """
+    Precomputed values kept in a dependency graph.
+
+    Sources are external inputs identified only by a version token (e.g. a
+    fingerprint of a price series); nodes are values computed from sources and
+    other nodes. update() takes the current source versions and recomputes only
+    the nodes downstream of a source whose version changed, in dependency
+    order. A node whose recomputed value equals the previous one does not
+    invalidate its dependents. Reads are plain dictionary lookups.
+
+    A node that fails keeps its previous value and is retried on the next
+    update() even if its inputs did not change. Each update() also records
+    which nodes it left current (computed, or clean with current inputs), so
+    get() can refuse values that have not been current for too long, e.g.
+    when a node keeps failing or updates stop running.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, Optional[Hashable]] = {}
+        self._nodes: Dict[str, _Node] = {}  # insertion order is a topological order
+        self._values: Dict[str, Any] = {}
+        self._current_at: Dict[str, float] = {}  # time.monotonic() of the last update() that left a node current
+        self._dirty: Set[str] = set()
+        self._lock = asyncio.Lock()
+        self._updates = 0
+        self._recomputed = 0
+        self._errors = 0
+        self._updated_at: Optional[float] = None
+
+    def add_source(self, name: str) -> None:
+        self._sources.setdefault(name, None)
+
+    def add(
+        self,
+        name: str,
+        compute: Callable[[], Awaitable[Any]],
+        inputs: Tuple[str, ...],
+        on_change: Optional[ChangeListener] = None,
+    ) -> None:
+        """
+        Register a node computed by `compute()` from `inputs` (sources or earlier nodes).
+
+        Raises:
+            ValueError: Duplicate name or unknown input
+        """
+        if name in self._nodes or name in self._sources:
+            raise ValueError(f"Duplicate materialized value {name!r}")
+        unknown = [i for i in inputs if i not in self._nodes and i not in self._sources]
+        if unknown:
+            raise ValueError(f"Unknown inputs of {name!r}: {unknown}")
+        self._nodes[name] = _Node(compute=compute, inputs=tuple(inputs), on_change=on_change)
+        self._dirty.add(name)
+
+    def get(self, name: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """
+        Current value of a node, or None if it was never computed or, with
+        `max_age`, was last known to be current more than `max_age` seconds ago.
+        """
+        if max_age is not None and time.monotonic() - self._current_at.get(name, float("-inf")) > max_age:
+            return None
+        return self._values.get(name)
+
+    async def update(self, versions: Mapping[str, Optional[Hashable]]) -> Dict[str, Any]:
+        """
+        Record the current source versions and recompute what they affect.
+
+        Returns:
+            {"changed_sources", "recomputed", "changed", "errors": {node: message}}
+        """
+        async with self._lock:
+            changed: Set[str] = set()
+            for source, version in versions.items():
+                if source not in self._sources:
+                    raise ValueError(f"Unknown source {source!r}")
+                if self._sources[source] != version:
+                    self._sources[source] = version
+                    changed.add(source)
+            changed_sources = sorted(changed)
+
+            recomputed: List[str] = []
+            errors: Dict[str, str] = {}
+            behind: Set[str] = set()  # failed nodes and everything downstream of them
+            now = time.monotonic()
+            for name, node in self._nodes.items():
+                if behind.intersection(node.inputs):
+                    behind.add(name)
+                if name not in self._dirty and not changed.intersection(node.inputs):
+                    if name not in behind:
+                        self._current_at[name] = now
+                    continue
+                recomputed.append(name)
+                previous = self._values.get(name)
+                try:
+                    value = await node.compute()
+                except Exception as e:
+                    self._dirty.add(name)
+                    behind.add(name)
+                    errors[name] = str(getattr(e, "detail", e))
+                    continue
+                self._dirty.discard(name)
+                if name not in behind:
+                    self._current_at[name] = now
+                if name in self._values and value == previous:
+                    continue
+                self._values[name] = value
+                changed.add(name)
+                if node.on_change is not None:
+                    try:
+                        node.on_change(previous, value)
+                    except Exception:
+                        logger.warning("Change listener failed for %s", name, exc_info=True)
+
+            self._updates += 1
+            self._recomputed += len(recomputed)
+            self._errors += len(errors)
+            self._updated_at = time.time()
+            return {
+                "changed_sources": changed_sources,
+                "recomputed": recomputed,
+                "changed": [name for name in recomputed if name in changed],
+                "errors": errors,
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "nodes": len(self._nodes),
+            "materialized": len(self._values),
+            "pending": len(self._dirty),
+            "updates": self._updates,
+            "recomputed": self._recomputed,
+            "errors": self._errors,
+            "updated_at": self._updated_at,
+        }
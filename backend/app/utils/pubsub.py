@@ -0,0 +1,91 @@
+import asyncio
+from typing import Any, Dict, Hashable, Iterable, Set
+
+
+class Subscription:
+    """A subscriber's bounded message queue for a fixed set of topics."""
+
+    def __init__(self, broadcaster: "Broadcaster", topics: Iterable[Hashable], queue_size: int):
+        self.topics: Set[Hashable] = set(topics)
+        self.queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._broadcaster = broadcaster
+        self._active = False
+
+    async def get(self) -> Any:
+        """Wait for the next message."""
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self._broadcaster._unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _offer(self, message: Any) -> None:
+        # A slow consumer loses its oldest message rather than blocking publishers
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+
+class Broadcaster:
+    """
+    In-process topic fan-out for push streams.
+
+    publish() never blocks: every subscriber has a bounded queue and drops its
+    oldest message when full. Must be used from a single event loop.
+    """
+
+    def __init__(self, queue_size: int = 32, max_subscribers: int = 1000):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Dict[Hashable, Set[Subscription]] = {}
+        self._count = 0
+        self._published = 0
+
+    def subscribe(self, topics: Iterable[Hashable]) -> Subscription:
+        """
+        Register a subscriber for `topics`; use as a context manager to unsubscribe.
+
+        Raises:
+            RuntimeError: max_subscribers reached
+        """
+        if self._count >= self.max_subscribers:
+            raise RuntimeError("Too many subscribers")
+        subscription = Subscription(self, topics, self.queue_size)
+        for topic in subscription.topics:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        subscription._active = True
+        self._count += 1
+        return subscription
+
+    def publish(self, topic: Hashable, message: Any) -> int:
+        """Queue `message` for every subscriber of `topic`; returns the number of receivers."""
+        subscribers = self._subscribers.get(topic, ())
+        for subscription in subscribers:
+            subscription._offer(message)
+        self._published += 1
+        return len(subscribers)
+
+    def has_subscribers(self, topic: Hashable) -> bool:
+        return bool(self._subscribers.get(topic))
+
+    def stats(self) -> Dict[str, int]:
+        return {"subscribers": self._count, "topics": len(self._subscribers), "published": self._published}
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        if not subscription._active:
+            return
+        subscription._active = False
+        for topic in subscription.topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[topic]
+        self._count -= 1
@@ -0,0 +1,97 @@
+import asyncio
+import inspect
+import logging
+import random
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PeriodicJob:
+    """A callable re-run every `interval` seconds (coroutine functions are awaited, others run in a thread)."""
+    name: str
+    func: Callable[[], Union[None, Awaitable[None]]]
+    interval: float
+    jitter: float = 0.1
+    initial_delay: float = 0.0
+    backoff_base: float = 5.0
+    max_backoff: float = 600.0
+    failures: int = 0
+
+    def next_delay(self) -> float:
+        """Seconds until the next run: interval on success, capped exponential backoff on failure."""
+        if self.failures:
+            delay = min(self.max_backoff, self.backoff_base * 2 ** (self.failures - 1))
+        else:
+            delay = self.interval
+        # Jitter keeps jobs (and worker processes) from hitting upstream in lockstep
+        return max(0.0, delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+
+class BackgroundScheduler:
+    """
+    Runs PeriodicJobs as asyncio tasks for the lifetime of the application.
+
+    Blocking job functions are executed with asyncio.to_thread so they never
+    occupy the event loop; coroutine functions are awaited directly.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, PeriodicJob] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Union[None, Awaitable[None]]],
+        interval: float,
+        jitter: float = 0.1,
+        initial_delay: float = 0.0,
+    ) -> PeriodicJob:
+        job = PeriodicJob(name=name, func=func, interval=interval, jitter=jitter, initial_delay=initial_delay)
+        self._jobs[name] = job
+        return job
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start one task per job. Must be called from a running event loop."""
+        if self._tasks:
+            return
+        for job in self._jobs.values():
+            self._tasks.append(asyncio.create_task(self._run(job), name=f"job:{job.name}"))
+
+    async def stop(self) -> None:
+        """Cancel all job tasks and wait for them to finish."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def status(self) -> Dict[str, Dict[str, float]]:
+        """Interval and consecutive failure count of each job."""
+        return {
+            name: {"interval": job.interval, "failures": job.failures}
+            for name, job in self._jobs.items()
+        }
+
+    async def _run(self, job: PeriodicJob) -> None:
+        if job.initial_delay:
+            await asyncio.sleep(job.initial_delay)
+        while True:
+            try:
+                if inspect.iscoroutinefunction(job.func):
+                    await job.func()
+                else:
+                    await asyncio.to_thread(job.func)
+                job.failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                job.failures += 1
+                logger.warning("Background job %s failed (%d in a row)", job.name, job.failures, exc_info=True)
+            await asyncio.sleep(job.next_delay())
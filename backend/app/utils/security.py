@@ -1,9 +1,27 @@
+import asyncio
+import hashlib
+import logging
 import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, TypeVar
+
 import bcrypt
 from jose import jwt, JWTError
 from fastapi import HTTPException, status
 from dotenv import load_dotenv
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from app.database import SessionLocal
+from app.models.revoked_token import RevokedToken
+from app.utils.cache import TTLCache
+from app.utils.scheduler import BackgroundScheduler
+
+logger = logging.getLogger(__name__)
 
 # .env 파일 로드
 load_dotenv()
@@ -13,6 +31,32 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
 
+# bcrypt 비용(라운드) - 변경 시 기존 해시는 다음 로그인 때 자동으로 재해싱
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# bcrypt 전용 스레드 풀: 요청 처리용 스레드 풀을 점유하지 않도록 분리
+# 실행 중 + 대기 중 작업이 한도를 넘으면 429로 즉시 거절
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "8"))
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE)
+
+T = TypeVar("T")
+
+# 검증된 토큰 캐시 (토큰 SHA-256 -> 페이로드), 항목 수명은 토큰의 exp를 넘지 않음
+TOKEN_CACHE_MAX_TTL = float(os.getenv("TOKEN_CACHE_MAX_TTL", "300"))
+_token_cache = TTLCache(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "4096")))
+
+# 폐기된 토큰 목록: 원본은 DB의 revoked_tokens 테이블 (모든 워커가 공유, 토큰 만료 전에는 삭제하지 않음)
+# 각 워커는 만료 전인 항목을 메모리(토큰 SHA-256 -> exp)에 두고, 백그라운드 작업이
+# REVOCATION_SYNC_INTERVAL초마다 새로 추가된 행만 읽어 옴 (토큰 검증 경로는 DB를 열지 않음).
+# 다른 워커에서 폐기한 토큰은 최대 이 간격만큼 늦게 거부됨
+REVOCATION_SYNC_INTERVAL = float(os.getenv("REVOCATION_SYNC_INTERVAL", "5"))
+_revoked_tokens: Dict[str, float] = {}
+_revocation_lock = threading.Lock()
+_revocation_state = {"last_id": 0, "sync_errors": 0}
+_revocation_scheduler = BackgroundScheduler()
+
 
 def hash_password(password: str) -> str:
     """
@@ -26,7 +70,7 @@ def hash_password(password: str) -> str:
     """
     # bcrypt는 bytes를 요구하므로 encode 필요
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt(rounds=12)
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     # 문자열로 반환 (데이터베이스 저장용)
     return hashed.decode('utf-8')
@@ -48,6 +92,50 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    해시의 bcrypt 비용이 현재 설정(BCRYPT_ROUNDS)과 다른지 확인합니다.
+
+    Args:
+        hashed_password: 해싱된 비밀번호 ($2b$<rounds>$...)
+
+    Returns:
+        재해싱이 필요하면 True
+    """
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password를 bcrypt 전용 스레드 풀에서 실행합니다 (포화 시 429)."""
+    return await _run_password_task(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password를 bcrypt 전용 스레드 풀에서 실행합니다 (포화 시 429)."""
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+
+async def _run_password_task(func: Callable[..., T], *args: Any) -> T:
+    # 대기열까지 가득 차면 기다리지 않고 거절 (로그인 폭주가 다른 요청 지연으로 번지지 않도록)
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many password operations in progress, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = _hash_executor.submit(func, *args)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    # 슬롯은 bcrypt 작업이 실제로 끝날 때 반환 (요청이 취소되어도 실행 중인 작업은 멈추지 않음)
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return await asyncio.wrap_future(future)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """
     JWT 액세스 토큰을 생성합니다.
@@ -66,7 +154,8 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire})
+    # jti: 같은 초에 발급된 토큰도 서로 달라야 하나만 폐기할 수 있음
+    to_encode.update({"exp": expire, "jti": secrets.token_hex(8)})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
     return encoded_jwt
@@ -83,14 +172,146 @@ def decode_access_token(token: str) -> dict:
         디코딩된 토큰 페이로드 (user_id 포함)
 
     Raises:
-        HTTPException: 토큰이 유효하지 않거나 만료된 경우 401 에러
+        HTTPException: 토큰이 유효하지 않거나, 만료되었거나, 폐기된 경우 401 에러
+    """
+    key = _token_key(token)
+    if key not in _revoked_tokens:
+        # 같은 토큰을 최근에 검증했다면 서명 검증과 클레임 파싱을 생략
+        cached = _token_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            payload = None
+
+        if payload is not None:
+            ttl = min(_seconds_until_expiry(payload), TOKEN_CACHE_MAX_TTL)
+            if ttl > 0:
+                _token_cache.set(key, payload, ttl)
+            return dict(payload)
+
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def decode_access_token_async(token: str) -> dict:
+    """
+    decode_access_token의 비동기 버전 (async 라우트/의존성용).
+
+    폐기 목록은 백그라운드 작업이 동기화하므로 검증은 메모리와 CPU만 사용하며
+    이벤트 루프를 막는 I/O가 없습니다.
+
+    Raises:
+        HTTPException: 토큰이 유효하지 않거나, 만료되었거나, 폐기된 경우 401 에러
+    """
+    return decode_access_token(token)
+
+
+def revoke_token(token: str) -> None:
+    """
+    토큰을 폐기합니다 (블로킹, DB 쓰기 포함).
+
+    revoked_tokens 테이블에 토큰 해시를 기록하고 캐시된 검증 결과를 제거합니다.
+    이 워커는 즉시, 다른 워커는 REVOCATION_SYNC_INTERVAL초 이내에 토큰이 만료될
+    때까지 decode_access_token에서 이 토큰을 거부합니다.
+
+    Args:
+        token: JWT 토큰 문자열
     """
+    key = _token_key(token)
+    _token_cache.invalidate(key)
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        exp = jwt.get_unverified_claims(token).get("exp")
+        # exp가 없는 토큰은 만료되지 않으므로 폐기 기록도 영구 보관
+        exp = float("inf") if exp is None else float(exp)
+    except (JWTError, TypeError, ValueError):
+        return  # 디코딩할 수 없는 토큰은 어차피 검증에 실패
+    now = time.time()
+    if exp <= now:
+        return
+
+    db = SessionLocal()
+    try:
+        # 만료된 폐기 기록은 더 이상 필요 없음
+        db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        db.add(RevokedToken(token_hash=key, expires_at=exp))
+        db.commit()
+    except IntegrityError:
+        db.rollback()  # 이미 폐기된 토큰
+    finally:
+        db.close()
+    with _revocation_lock:
+        _revoked_tokens[key] = exp
+
+
+def token_cache_stats() -> Dict[str, Any]:
+    """검증된 토큰 캐시의 적중률과 폐기 목록 동기화 상태를 반환합니다."""
+    stats = _token_cache.stats()
+    with _revocation_lock:
+        stats["revoked"] = len(_revoked_tokens)
+        stats["revocation_sync_errors"] = _revocation_state["sync_errors"]
+    return stats
+
+
+def sync_revocations() -> None:
+    """
+    마지막 동기화 이후 다른 워커가 추가한 폐기 기록을 읽어 옵니다 (블로킹, DB 조회 포함).
+
+    기본 키 범위만 조회하며, 조회는 잠금 밖에서 수행하고 결과 병합과 만료 항목 정리만
+    잠금 안에서 합니다 (검증, 폐기, 통계 조회가 DB 응답을 기다리지 않도록).
+    백그라운드 작업에서 호출되며 실패하면 예외를 올려 스케줄러가 재시도 간격을 늘립니다.
+    """
+    now = time.time()
+    last_id = _revocation_state["last_id"]
+    try:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(RevokedToken.id, RevokedToken.token_hash, RevokedToken.expires_at)
+                .where(RevokedToken.id > last_id, RevokedToken.expires_at > now)
+                .order_by(RevokedToken.id)
+            ).all()
+        finally:
+            db.close()
+    except Exception:
+        # DB를 읽지 못하면 이 워커에서 이미 알고 있는 폐기 목록으로 계속 검증
+        with _revocation_lock:
+            _revocation_state["sync_errors"] += 1
+        raise
+    with _revocation_lock:
+        for row in rows:
+            _revoked_tokens[row.token_hash] = row.expires_at
+        if rows:
+            _revocation_state["last_id"] = max(_revocation_state["last_id"], rows[-1].id)
+        for expired in [k for k, exp in _revoked_tokens.items() if exp <= now]:
+            del _revoked_tokens[expired]
+
+
+def start_revocation_sync() -> None:
+    """폐기 목록 동기화 작업을 시작합니다 (앱 lifespan에서 호출, 시작 직후 한 번 즉시 동기화)."""
+    if _revocation_scheduler.running:
+        return
+    _revocation_scheduler.add_job("revocations", sync_revocations, interval=REVOCATION_SYNC_INTERVAL)
+    _revocation_scheduler.start()
+
+
+async def stop_revocation_sync() -> None:
+    """폐기 목록 동기화 작업을 중지합니다."""
+    await _revocation_scheduler.stop()
+
+
+def _token_key(token: str) -> str:
+    # 원본 토큰 대신 해시를 키로 사용 (메모리에 토큰 문자열을 보관하지 않음)
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _seconds_until_expiry(payload: Dict[str, Any]) -> float:
+    exp = payload.get("exp")
+    if exp is None:
+        return TOKEN_CACHE_MAX_TTL
+    return float(exp) - time.time()
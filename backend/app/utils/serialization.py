@@ -0,0 +1,50 @@
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+BAR_FIELDS = ("date", "open", "high", "low", "close", "volume")
+_PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+
+def bar_columns(frame: pd.DataFrame, decimals: int = 2) -> Dict[str, List[Any]]:
+    """
+    Convert an OHLCV frame into parallel JSON-ready lists, one per field.
+
+    Prices are rounded as whole columns; with decimals=0 they become ints.
+    Missing volume is reported as 0.
+    """
+    prices = np.round(frame[_PRICE_COLUMNS].to_numpy(dtype=float), decimals)
+    if decimals == 0:
+        prices = prices.astype(np.int64)
+    columns: Dict[str, List[Any]] = {"date": frame.index.strftime("%Y-%m-%d").tolist()}
+    for i, name in enumerate(("open", "high", "low", "close")):
+        columns[name] = prices[:, i].tolist()
+    columns["volume"] = np.nan_to_num(frame["Volume"].to_numpy(dtype=float)).astype(np.int64).tolist()
+    return columns
+
+
+def columns_to_records(columns: Dict[str, List[Any]], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """Zip parallel lists into a list of dicts with the given keys."""
+    return [dict(zip(fields, row)) for row in zip(*(columns[f] for f in fields))]
+
+
+def bars_to_records(frame: pd.DataFrame, decimals: int = 2) -> List[Dict[str, Any]]:
+    """Convert an OHLCV frame into [{date, open, high, low, close, volume}, ...]."""
+    return columns_to_records(bar_columns(frame, decimals), BAR_FIELDS)
+
+
+def records_to_columnar(records: List[Dict[str, Any]], fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Convert [{date, ...}, ...] into a compact columnar payload.
+
+    Dates become integer day offsets from `epoch_day` (days since 1970-01-01 of
+    the first record), every other field becomes a parallel list.
+    """
+    days = np.array([r["date"] for r in records], dtype="datetime64[D]").astype(np.int64)
+    epoch_day = int(days[0]) if len(days) else 0
+    payload: Dict[str, Any] = {"epoch_day": epoch_day, "day_offsets": (days - epoch_day).tolist()}
+    for field in fields:
+        if field != "date":
+            payload[field] = [r[field] for r in records]
+    return payload
@@ -0,0 +1,236 @@
+import asyncio
+import inspect
+import logging
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Protocol, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# fetcher(start, end) -> DataFrame indexed by date with OHLCV_COLUMNS; `end` is exclusive.
+# Blocking fetchers run in a worker thread, coroutine fetchers are awaited.
+Fetcher = Callable[[datetime, datetime], Union[pd.DataFrame, Awaitable[pd.DataFrame]]]
+
+# listener(frame) is called with a symbol's full stored frame whenever it changes
+SeriesListener = Callable[[pd.DataFrame], None]
+
+
+class BarPersistence(Protocol):
+    """Durable storage for daily bars (see app.utils.bar_store.SqlBarStore)."""
+
+    def load(self, symbol: str, since: date) -> pd.DataFrame: ...
+
+    def save(self, symbol: str, frame: pd.DataFrame) -> None: ...
+
+
+def normalize_bars(frame: pd.DataFrame) -> pd.DataFrame:
+    """Keep OHLCV columns and index bars by tz-naive calendar date, oldest first."""
+    frame = frame[OHLCV_COLUMNS].copy()
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame.index = index.normalize()
+    frame["Volume"] = frame["Volume"].fillna(0)
+    frame = frame[~frame.index.duplicated(keep="last")]
+    return frame.sort_index()
+
+
+@dataclass
+class _Series:
+    fetcher: Fetcher
+    max_age: float
+    frame: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=OHLCV_COLUMNS))
+    refreshed_at: float = float("-inf")  # time.monotonic() of the last refresh
+
+
+class SeriesStore:
+    """
+    Holds the longest daily history of each symbol once and serves any shorter
+    period as a slice of it.
+
+    The first load downloads `history_days` of bars; later refreshes only fetch
+    from the last stored bar onward and append (the last bar is replaced since it
+    may still be changing intraday). Slices share memory with the stored frame.
+
+    With a `persistence` backend, fetched bars are also saved and warm() reloads
+    them, so a restarted process only downloads what is newer than its disk copy.
+
+    Blocking fetchers run on `executor` (the loop's default executor if None),
+    which bounds how many blocking downloads run at once.
+
+    Listeners added with add_listener() see every new version of a symbol's
+    frame (after warm() and after each refresh that fetched bars).
+    """
+
+    def __init__(
+        self,
+        history_days: int = 1825,
+        persistence: Optional[BarPersistence] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.history_days = history_days
+        self.persistence = persistence
+        self.executor = executor
+        self._series: Dict[str, _Series] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._listeners: Dict[str, List[SeriesListener]] = {}
+
+    def register(self, symbol: str, fetcher: Fetcher, max_age: float = 300.0) -> None:
+        """Register a symbol with its fetcher; data older than `max_age` seconds is refreshed on read."""
+        self._series[symbol] = _Series(fetcher=fetcher, max_age=max_age)
+
+    def add_listener(self, symbol: str, listener: SeriesListener) -> None:
+        """Call `listener(frame)` whenever the symbol's stored bars change (and now, if it has data)."""
+        self._listeners.setdefault(symbol, []).append(listener)
+        frame = self._series[symbol].frame
+        if not frame.empty:
+            self._notify_one(symbol, listener, frame)
+
+    def warm(self) -> Dict[str, int]:
+        """
+        Load persisted bars for every registered symbol that has no data yet.
+
+        Loaded symbols are still considered stale, so the next read fetches only
+        the bars after the last persisted one. Blocking; run it before serving
+        (or in a worker thread).
+
+        Returns:
+            Number of bars loaded per symbol
+        """
+        loaded: Dict[str, int] = {}
+        if self.persistence is None:
+            return loaded
+        since = (datetime.now() - timedelta(days=self.history_days + 1)).date()
+        for symbol, series in self._series.items():
+            if not series.frame.empty:
+                continue
+            try:
+                frame = self.persistence.load(symbol, since)
+            except Exception:
+                logger.warning("Failed to load persisted %s bars", symbol, exc_info=True)
+                continue
+            if not frame.empty:
+                series.frame = normalize_bars(frame)
+                self._notify(symbol)
+            loaded[symbol] = len(frame)
+        return loaded
+
+    async def get(self, symbol: str, days: int) -> pd.DataFrame:
+        """
+        Return the bars of the last `days` calendar days.
+
+        Refreshes the symbol first if its data is older than max_age. When the
+        refresh fails but older data exists, the older data is served.
+
+        Raises:
+            KeyError: Unknown symbol
+            Exception: The fetcher's error when there is no data to fall back on
+        """
+        series = self._series[symbol]
+        if time.monotonic() - series.refreshed_at >= series.max_age:
+            try:
+                await self.refresh(symbol)
+            except Exception:
+                if series.frame.empty:
+                    raise
+                # Don't retry upstream on every read while it is down
+                series.refreshed_at = time.monotonic()
+                logger.warning("Serving cached %s bars after failed refresh", symbol, exc_info=True)
+        return self._slice(series.frame, days)
+
+    async def refresh(self, symbol: str) -> int:
+        """
+        Fetch bars newer than the stored ones and append them.
+
+        Only one refresh per symbol runs at a time; callers arriving meanwhile
+        await the running one and share its result.
+
+        Returns:
+            Number of bars fetched
+        """
+        task = self._inflight.get(symbol)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._refresh(symbol))
+            self._inflight[symbol] = task
+            task.add_done_callback(lambda _: self._inflight.pop(symbol, None))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, symbol: str) -> int:
+        series = self._series[symbol]
+        end = datetime.now() + timedelta(days=1)
+        frame = series.frame
+        if frame.empty:
+            start = end - timedelta(days=self.history_days + 1)
+        else:
+            start = frame.index[-1].to_pydatetime()
+
+        if inspect.iscoroutinefunction(series.fetcher):
+            fetched = await series.fetcher(start, end)
+        else:
+            loop = asyncio.get_running_loop()
+            fetched = await loop.run_in_executor(self.executor, series.fetcher, start, end)
+        count = 0 if fetched is None else len(fetched)
+        if count:
+            fetched = normalize_bars(fetched)
+            await asyncio.to_thread(self._persist, symbol, fetched)
+            if not frame.empty:
+                fetched = pd.concat([frame[frame.index < fetched.index[0]], fetched])
+            cutoff = pd.Timestamp(end - timedelta(days=self.history_days + 1)).normalize()
+            # Assign a new frame so readers holding the previous slice are unaffected
+            series.frame = fetched[fetched.index >= cutoff]
+            self._notify(symbol)
+        elif frame.empty:
+            raise ValueError(f"No data returned for {symbol}")
+        series.refreshed_at = time.monotonic()
+        return count
+
+    def _persist(self, symbol: str, bars: pd.DataFrame) -> None:
+        if self.persistence is None:
+            return
+        try:
+            self.persistence.save(symbol, bars)
+        except Exception:
+            # Persistence is best effort; the in-memory series is still updated
+            logger.warning("Failed to persist %s bars", symbol, exc_info=True)
+
+    def _notify(self, symbol: str) -> None:
+        frame = self._series[symbol].frame
+        for listener in self._listeners.get(symbol, ()):
+            self._notify_one(symbol, listener, frame)
+
+    @staticmethod
+    def _notify_one(symbol: str, listener: SeriesListener, frame: pd.DataFrame) -> None:
+        try:
+            listener(frame)
+        except Exception:
+            logger.warning("Series listener failed for %s", symbol, exc_info=True)
+
+    def last_date(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Date of the newest stored bar (None without data)."""
+        frame = self._series[symbol].frame
+        return None if frame.empty else frame.index[-1]
+
+    def version(self, symbol: str) -> Optional[tuple]:
+        """
+        Fingerprint of the stored bars that changes whenever their content does
+        (None without data).
+
+        Refreshes only replace the last bar, append newer ones and trim the
+        oldest, so the range, length and last bar identify the content.
+        """
+        frame = self._series[symbol].frame
+        if frame.empty:
+            return None
+        return (frame.index[0], frame.index[-1], len(frame), tuple(frame.iloc[-1].tolist()))
+
+    @staticmethod
+    def _slice(frame: pd.DataFrame, days: int) -> pd.DataFrame:
+        start = pd.Timestamp(datetime.now() - timedelta(days=days)).normalize()
+        # Positional row slice of a date-sorted frame is a view, not a copy
+        return frame.iloc[frame.index.searchsorted(start):]
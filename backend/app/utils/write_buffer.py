@@ -0,0 +1,177 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+Writer = Callable[[Hashable, Dict[Hashable, Any]], None]
+
+
+class WriteBehindBuffer:
+    """
+    Debounced, coalescing write-behind buffer.
+
+    Items are submitted per group (e.g. per user) as {key: value}; a later
+    value for the same key replaces the earlier one. A group is written with a
+    single `writer(group, items)` call once no new item has arrived for
+    `delay` seconds, or at the latest `max_delay` seconds after its first
+    pending item. With delay <= 0 every submit is written through immediately
+    and never staged: a failed write raises to the caller and is not retried.
+
+    flush(group) writes a group synchronously (flush-on-read); pending(group)
+    exposes what is still unwritten, e.g. after a failed flush.
+    """
+
+    def __init__(self, writer: Writer, delay: float = 0.5, max_delay: float = 2.0):
+        self.delay = delay
+        self.max_delay = max(delay, max_delay)
+        self._writer = writer
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Dict[Hashable, Any]] = {}
+        self._first_at: Dict[Hashable, float] = {}
+        self._timers: Dict[Hashable, threading.Timer] = {}
+        self._flush_locks: Dict[Hashable, threading.Lock] = {}
+        self._submitted = 0
+        self._coalesced = 0
+        self._flushes = 0
+        self._flush_errors = 0
+
+    def submit(self, group: Hashable, items: Dict[Hashable, Any]) -> None:
+        """
+        Queue items for a group (or write them now in write-through mode).
+
+        Raises:
+            Exception: Only in write-through mode (delay <= 0), from the writer;
+                the items are dropped, so a write reported as failed never lands later
+        """
+        if not items:
+            return
+        if self.delay <= 0:
+            self._write_through(group, dict(items))
+            return
+        with self._lock:
+            pending = self._pending.setdefault(group, {})
+            self._coalesced += sum(1 for key in items if key in pending)
+            self._submitted += len(items)
+            pending.update(items)
+            self._schedule(group)
+
+    def flush(self, group: Hashable) -> None:
+        """
+        Write the group's pending items now, waiting for a flush already in progress.
+
+        On failure the items are put back (unless newer values arrived meanwhile)
+        and the writer's exception is raised.
+        """
+        with self._flush_lock(group):
+            with self._lock:
+                items = self._take(group)
+            if not items:
+                return
+            try:
+                self._writer(group, items)
+            except Exception:
+                with self._lock:
+                    self._flush_errors += 1
+                    pending = self._pending.setdefault(group, {})
+                    for key, value in items.items():
+                        pending.setdefault(key, value)
+                raise
+            with self._lock:
+                self._flushes += 1
+
+    def flush_all(self) -> None:
+        """Flush every group (e.g. on shutdown); failures are logged, not raised."""
+        with self._lock:
+            groups = list(self._pending)
+        for group in groups:
+            self._flush_quietly(group)
+
+    def discard(self, group: Hashable, keys: Optional[Iterable[Hashable]] = None) -> None:
+        """
+        Drop pending items of a group (all of them if `keys` is None).
+
+        Waits for an in-progress flush so a superseded value cannot land after
+        the caller's own write.
+        """
+        with self._flush_lock(group):
+            with self._lock:
+                if keys is None:
+                    self._take(group)
+                    return
+                pending = self._pending.get(group)
+                if pending is None:
+                    return
+                for key in keys:
+                    pending.pop(key, None)
+                if not pending:
+                    self._take(group)
+
+    def is_idle(self, group: Hashable) -> bool:
+        """True if the group has nothing pending and no flush in progress (flush() would be a no-op)."""
+        with self._lock:
+            flush_lock = self._flush_locks.get(group)
+            return group not in self._pending and (flush_lock is None or not flush_lock.locked())
+
+    def pending(self, group: Hashable) -> Dict[Hashable, Any]:
+        """Return a copy of the group's unwritten items."""
+        with self._lock:
+            return dict(self._pending.get(group, {}))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pending_groups": len(self._pending),
+                "pending_items": sum(len(items) for items in self._pending.values()),
+                "submitted": self._submitted,
+                "coalesced": self._coalesced,
+                "flushes": self._flushes,
+                "flush_errors": self._flush_errors,
+            }
+
+    def _write_through(self, group: Hashable, items: Dict[Hashable, Any]) -> None:
+        # Serialized with flushes of the same group, like a flush of just these items
+        with self._flush_lock(group):
+            with self._lock:
+                self._submitted += len(items)
+            try:
+                self._writer(group, items)
+            except Exception:
+                with self._lock:
+                    self._flush_errors += 1
+                raise
+            with self._lock:
+                self._flushes += 1
+
+    def _schedule(self, group: Hashable) -> None:
+        # Caller holds self._lock; restart the debounce timer, capped at max_delay
+        now = time.monotonic()
+        first = self._first_at.setdefault(group, now)
+        due = min(now + self.delay, first + self.max_delay)
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        timer = threading.Timer(max(0.0, due - now), self._flush_quietly, args=(group,))
+        timer.daemon = True
+        self._timers[group] = timer
+        timer.start()
+
+    def _take(self, group: Hashable) -> Optional[Dict[Hashable, Any]]:
+        # Caller holds self._lock
+        self._first_at.pop(group, None)
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        return self._pending.pop(group, None)
+
+    def _flush_lock(self, group: Hashable) -> threading.Lock:
+        with self._lock:
+            return self._flush_locks.setdefault(group, threading.Lock())
+
+    def _flush_quietly(self, group: Hashable) -> None:
+        try:
+            self.flush(group)
+        except Exception:
+            # Items stay pending; the next submit, read or shutdown flush retries
+            logger.warning("Write-behind flush failed for group %r", group, exc_info=True)
@@ -0,0 +1,157 @@
+"""
+TTLCache tests: single-flight loads, stale-while-revalidate, LRU eviction and
+loader-provided lifetimes (Expiring).
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.utils.cache import Expiring, TTLCache
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache()
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(cache.aget_or_set("k", 60, load) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["value"] * 5
+    assert len(loads) == 1
+    assert cache.stats()["loads"] == 1
+
+
+def test_failed_load_is_raised_to_every_waiter_and_not_cached():
+    cache = TTLCache()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise RuntimeError("upstream down")
+        return "value"
+
+    async def main():
+        results = await asyncio.gather(*(cache.aget_or_set("k", 60, load) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert cache.get("k") is None
+        assert await cache.aget_or_set("k", 60, load) == "value"
+
+    asyncio.run(main())
+    assert len(calls) == 2
+    assert cache.stats()["load_errors"] == 1
+
+
+def test_cancelled_caller_does_not_abort_the_shared_load():
+    cache = TTLCache()
+
+    async def load():
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def main():
+        first = asyncio.create_task(cache.aget_or_set("k", 60, load))
+        second = asyncio.create_task(cache.aget_or_set("k", 60, load))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == "value"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(main())
+    assert cache.get("k") == "value"
+
+
+def test_stale_value_is_served_while_one_refresh_runs():
+    cache = TTLCache(stale_ttl=5)
+    versions = iter(["old", "new"])
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.05)
+        return next(versions)
+
+    async def main():
+        assert await cache.aget_or_set("k", 0.05, load) == "old"
+        await asyncio.sleep(0.06)
+        # Expired but within stale_ttl: answered immediately from the old value
+        stale = await asyncio.gather(*(cache.aget_or_set("k", 0.05, load) for _ in range(3)))
+        assert stale == ["old"] * 3
+        assert cache.stats()["refreshing"] == 1
+        await asyncio.sleep(0.08)
+        assert cache.get("k") == "new"
+
+    asyncio.run(main())
+    assert len(loads) == 2
+    assert cache.stats()["stale_hits"] == 3
+
+
+def test_failed_refresh_keeps_serving_the_stale_value():
+    cache = TTLCache(stale_ttl=5)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("upstream down")
+        return "old"
+
+    async def main():
+        await cache.aget_or_set("k", 0.02, load)
+        await asyncio.sleep(0.03)
+        assert await cache.aget_or_set("k", 0.02, load) == "old"
+        await asyncio.sleep(0.01)
+        assert await cache.aget_or_set("k", 0.02, load) == "old"
+
+    asyncio.run(main())
+    assert cache.stats()["load_errors"] >= 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1, 60)
+    cache.set("b", 2, 60)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3, 60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_purged_before_evicting_live_ones():
+    cache = TTLCache(maxsize=2)
+    cache.set("short", 1, 0.01)
+    cache.set("a", 2, 60)
+    time.sleep(0.02)
+    cache.set("b", 3, 60)
+    assert cache.get("a") == 2 and cache.get("b") == 3
+    assert cache.stats()["evictions"] == 0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_expiring_caps_the_entry_lifetime():
+    cache = TTLCache()
+
+    async def load():
+        return Expiring("value", 0.05)
+
+    async def main():
+        assert await cache.aget_or_set("k", 60, load) == "value"
+        assert cache.get("k") == "value"
+        await asyncio.sleep(0.06)
+        assert cache.get("k") is None
+
+    asyncio.run(main())
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0)
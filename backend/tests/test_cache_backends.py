@@ -0,0 +1,212 @@
+"""
+Cache backend and SharedCache tests.
+
+The Redis backend runs against RespStandIn, a minimal in-process server for the
+subset of the Redis protocol (RESP2) the backend uses, so no Redis server is
+needed. Requires pytest and the optional `redis` package for the Redis cases.
+"""
+import asyncio
+import hashlib
+import socketserver
+import threading
+import time
+
+import pytest
+
+from app.utils.cache import Expiring, TTLCache
+from app.utils.cache_backends import MemoryBackend, RedisBackend, SharedCache, SQLiteBackend
+
+
+class RespStandIn(socketserver.ThreadingTCPServer):
+    """GET, SET [PX ms] [NX], DEL and the compare-and-delete script of RedisBackend over RESP2."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _RespHandler)
+        self.store = {}
+        self.scripts = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.server_address[1]}/0?protocol=2"
+
+    def live(self, key):
+        entry = self.store.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self.store[key]
+            return None
+        return entry
+
+    def execute(self, args):
+        command = args[0].upper()
+        with self.lock:
+            if command == b"GET":
+                entry = self.live(args[1])
+                return None if entry is None else entry[0]
+            if command == b"SET":
+                options = [a.upper() for a in args[3:]]
+                expires_at = None
+                if b"PX" in options:
+                    expires_at = time.time() + int(args[3 + options.index(b"PX") + 1]) / 1000
+                if b"NX" in options and self.live(args[1]) is not None:
+                    return None
+                self.store[args[1]] = (args[2], expires_at)
+                return b"+OK"
+            if command == b"DEL":
+                return sum(1 for key in args[1:] if self.store.pop(key, None) is not None)
+            if command == b"SCRIPT" and args[1].upper() == b"LOAD":
+                sha = hashlib.sha1(args[2]).hexdigest().encode()
+                self.scripts[sha] = args[2]
+                return sha
+            if command in (b"EVAL", b"EVALSHA"):
+                script = args[1] if command == b"EVAL" else self.scripts.get(args[1])
+                if script is None:
+                    return ValueError("NOSCRIPT No matching script")
+                if script != RedisBackend.DELETE_IF_SCRIPT.encode():
+                    return ValueError("ERR script not supported by the stand-in")
+                key, expected = args[3], args[4]
+                entry = self.live(key)
+                if entry is not None and entry[0] == expected:
+                    del self.store[key]
+                    return 1
+                return 0
+        return b"+OK"  # CLIENT SETINFO, SELECT, ...
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                size = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(size + 2)[:-2])
+            self.wfile.write(_encode(self.server.execute(args)))
+
+
+def _encode(reply) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, ValueError):
+        return b"-" + str(reply).encode() + b"\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if reply.startswith(b"+"):
+        return reply + b"\r\n"
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+
+@pytest.fixture(scope="module")
+def resp_server():
+    server = RespStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        backend = MemoryBackend()
+    elif request.param == "sqlite":
+        backend = SQLiteBackend(str(tmp_path / "cache.db"))
+    else:
+        pytest.importorskip("redis")
+        backend = RedisBackend(request.getfixturevalue("resp_server").url, prefix=f"test:{time.time_ns()}:")
+    yield backend
+    backend.close()
+
+
+def test_get_set_expiry(backend):
+    backend.set("k", {"a": 1}, 0.2)
+    assert backend.get("k") == {"a": 1}
+    time.sleep(0.25)
+    assert backend.get("k") is None
+
+
+def test_add_is_exclusive_until_expiry(backend):
+    assert backend.add("lock", "a", 0.2)
+    assert not backend.add("lock", "b", 0.2)
+    time.sleep(0.25)
+    assert backend.add("lock", "b", 0.2)
+
+
+def test_delete_if_only_deletes_matching_value(backend):
+    backend.add("lock", "owner", 10)
+    assert not backend.delete_if("lock", "other")
+    assert backend.get("lock") == "owner"
+    assert backend.delete_if("lock", "owner")
+    assert backend.get("lock") is None
+
+
+def test_sqlite_close_closes_every_thread_connection(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.db"))
+    threads = [threading.Thread(target=backend.set, args=(f"k{i}", i, 10)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(backend._connections) == 4
+    backend.close()
+    assert backend._connections == []
+    # The backend reconnects if it is used again
+    assert backend.get("k1") == 1
+    backend.close()
+
+
+def test_shared_cache_loads_once_across_instances():
+    backend = MemoryBackend()
+    workers = [SharedCache(backend, poll_interval=0.01) for _ in range(3)]
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(w.aget_or_load("k", 60, load) for w in workers))
+
+    assert asyncio.run(main()) == ["value"] * 3
+    assert len(loads) == 1
+    assert backend.get("k:lock") is None
+
+
+def test_shared_cache_never_releases_a_lock_it_does_not_hold():
+    backend = MemoryBackend()
+    backend.add("k:lock", "other-worker", 10)
+    shared = SharedCache(backend, lock_timeout=0.05, poll_interval=0.01)
+
+    async def load():
+        return "value"
+
+    # The wait times out and the caller loads itself, leaving the other worker's lock alone
+    assert asyncio.run(shared.aget_or_load("k", 60, load)) == "value"
+    assert backend.get("k:lock") == "other-worker"
+
+
+def test_shared_value_is_cached_locally_only_for_its_remaining_ttl():
+    backend = MemoryBackend()
+    writer, reader = SharedCache(backend), SharedCache(backend)
+    local = TTLCache()
+
+    async def load():
+        return "value"
+
+    async def main():
+        await writer.aget_or_load("k", 0.3, load)
+        await asyncio.sleep(0.2)
+        cached = await reader.aget_or_load_expiring("k", 0.3, load)
+        assert isinstance(cached, Expiring) and cached.ttl <= 0.1
+        await local.aget_or_set("k", 0.3, lambda: reader.aget_or_load_expiring("k", 0.3, load))
+        await asyncio.sleep(0.15)
+        assert local.get("k") is None
+
+    asyncio.run(main())
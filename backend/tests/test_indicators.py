@@ -0,0 +1,138 @@
+"""
+Indicator tests: the streaming engine and the vectorized columns agree, rule
+sets evaluate the same row by row and column-wise, and the backtest scores
+signals as documented.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.backtest import backtest_signals
+from app.utils.indicators import DEFAULT_RULES, IndicatorEngine, RuleSet, indicator_columns
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    close = 2000 + np.cumsum(rng.normal(0, 15, 120))
+    frame = pd.DataFrame(
+        {"Open": close, "High": close + rng.uniform(0, 10, 120), "Low": close - rng.uniform(0, 10, 120), "Close": close},
+        index=pd.date_range("2024-01-01", periods=120),
+    )
+    frame.iloc[[10, 50], frame.columns.get_loc("High")] = np.nan  # missing highs fall back to the close
+    return frame
+
+
+def row(columns, i):
+    return {name: None if math.isnan(values[i]) else float(values[i]) for name, values in columns.items()}
+
+
+def assert_matches_last_row(snapshot, columns):
+    last = row(columns, -1)
+    assert snapshot.keys() == last.keys()
+    for name, value in snapshot.items():
+        assert value == pytest.approx(last[name], rel=1e-9), name
+
+
+def test_streaming_snapshot_matches_vectorized_columns(frame):
+    engine = IndicatorEngine()
+    assert engine.sync(frame) == len(frame)
+    assert_matches_last_row(engine.snapshot(), indicator_columns(frame))
+
+
+def test_indicators_stay_none_until_warmed_up(frame):
+    engine = IndicatorEngine()
+    engine.sync(frame.iloc[:10])
+    snapshot = engine.snapshot()
+    assert snapshot["sma5"] is not None
+    assert snapshot["sma20"] is None and snapshot["ema26"] is None
+    assert_matches_last_row(snapshot, indicator_columns(frame.iloc[:10]))
+
+
+def test_incremental_sync_with_revised_last_bar_matches_full_rebuild(frame):
+    engine = IndicatorEngine()
+    engine.sync(frame.iloc[:60])
+    revised = frame.iloc[:80].copy()
+    revised.iloc[59, revised.columns.get_loc("Close")] += 25  # the intraday bar closed elsewhere
+    # Only the revised bar and the new ones are applied
+    assert engine.sync(revised) == 21
+    assert engine.bars == 80
+    assert_matches_last_row(engine.snapshot(), indicator_columns(revised))
+
+
+def test_history_gap_rebuilds_state(frame):
+    engine = IndicatorEngine()
+    engine.sync(frame.iloc[:30])
+    engine.sync(frame.iloc[40:])
+    assert engine.bars == 80
+    assert_matches_last_row(engine.snapshot(), indicator_columns(frame.iloc[40:]))
+
+
+def test_rule_columns_match_row_by_row_evaluation(frame):
+    columns = indicator_columns(frame)
+    columns["premium_pct"] = np.linspace(0, 8, len(frame))
+    rules = RuleSet.from_dict({
+        "buy": [["sma5", ">", "sma20"], ["rsi14", "<", 70]],
+        "sell": [["close", "<", "bb20_lower"], ["premium_pct", ">", 5]],
+    })
+    for rule_set in (rules, DEFAULT_RULES):
+        signals = rule_set.evaluate_columns(columns, len(frame))
+        assert list(signals) == [rule_set.evaluate(row(columns, i)) for i in range(len(frame))]
+
+
+def test_explain_returns_the_deciding_conditions():
+    rules = RuleSet.from_dict({"buy": [["a", ">", 1], ["b", "<", 1]], "sell": [["a", "<", 0], ["b", ">", 5]]})
+    assert rules.explain({"a": 2, "b": 0}) == ("buy", rules.buy)
+    assert rules.explain({"a": -1, "b": 0}) == ("sell", rules.sell[:1])
+    assert rules.explain({"a": 0.5, "b": 3}) == ("hold", ())
+    # Operands that are not warmed up never hold
+    assert rules.explain({"a": None, "b": None}) == ("hold", ())
+    assert rules.sell[1].describe({"b": 6.0}) == "b (6.00) > 5"
+
+
+def test_rule_set_round_trips_through_dict():
+    assert RuleSet.from_dict(DEFAULT_RULES.to_dict()) == DEFAULT_RULES
+
+
+@pytest.mark.parametrize("data", [
+    [["sma5", ">", "sma20"]],
+    {"buy": "sma5 > sma20"},
+    {"buy": [["sma5", ">"]]},
+    {"buy": [["sma5", "==", "sma20"]]},
+    {"buy": [["sma5", ">", True]]},
+    {"buy": [["sma5", ">", None]]},
+    {"buy": [["sma5", ">", float("nan")]]},
+    {"sell": [["sma5", "<", float("inf")]]},
+    {"sell": [["sma5", "<", 10 ** 400]]},
+    {"sell": [["sma6", "<", 1]]},
+])
+def test_malformed_rule_sets_are_rejected(data):
+    with pytest.raises(ValueError):
+        RuleSet.from_dict(data, names={"sma5", "sma20"})
+
+
+def test_backtest_scores_signals_and_tracks_equity():
+    close = np.array([100.0, 110.0, 99.0, 99.0, 120.0])
+    signals = np.array(["buy", "sell", "hold", "buy", "hold"])
+    result = backtest_signals(close, signals, horizon=1)
+
+    # The last bar has no close one bar later, holds are never scored
+    assert list(result["hit"]) == [True, True, None, True, None]
+    # Long from the first close, flat after the sell, long again from the fourth
+    assert result["equity"] == pytest.approx([1.0, 1.1, 1.1, 1.1, 1.1 * 120 / 99])
+    assert result["benchmark"] == pytest.approx(close / 100)
+    summary = result["summary"]
+    assert (summary["buy_days"], summary["sell_days"], summary["hold_days"]) == (2, 1, 2)
+    assert summary["hit_rate"] == 1.0
+    assert summary["total_return_pct"] == pytest.approx((1.1 * 120 / 99 - 1) * 100)
+    assert summary["exposure_pct"] == pytest.approx(60.0)
+
+
+def test_backtest_missed_signals_and_drawdown():
+    close = np.array([100.0, 90.0, 95.0])
+    result = backtest_signals(close, np.array(["buy", "hold", "hold"]), horizon=2)
+    assert list(result["hit"]) == [False, None, None]
+    assert result["summary"]["hit_rate"] == 0.0
+    assert result["summary"]["max_drawdown_pct"] == pytest.approx(-10.0)
@@ -0,0 +1,106 @@
+"""
+Materializer tests: a source change recomputes only its downstream nodes,
+unchanged values stop propagation, and failed nodes are retried and reported
+as out of date.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.utils.materialize import Materializer
+
+
+class Graph:
+    """s1 -> a, s2 -> b, (a, b) -> c, with call counts and switchable values."""
+
+    def __init__(self):
+        self.values = {"a": 1, "b": 10}
+        self.calls = {"a": 0, "b": 0, "c": 0}
+        self.fail = set()
+        self.changes = []
+        self.materializer = Materializer()
+        self.materializer.add_source("s1")
+        self.materializer.add_source("s2")
+        self.materializer.add("a", self.node("a"), ("s1",))
+        self.materializer.add("b", self.node("b"), ("s2",))
+        self.materializer.add("c", self.node("c"), ("a", "b"), on_change=lambda old, new: self.changes.append((old, new)))
+
+    def node(self, name):
+        async def compute():
+            self.calls[name] += 1
+            if name in self.fail:
+                raise RuntimeError(f"{name} failed")
+            if name == "c":
+                return self.materializer.get("a") + self.materializer.get("b")
+            return self.values[name]
+        return compute
+
+    def update(self, **versions):
+        return asyncio.run(self.materializer.update(versions))
+
+
+def test_first_update_computes_every_node_in_dependency_order():
+    graph = Graph()
+    result = graph.update(s1=1, s2=1)
+    assert result["recomputed"] == ["a", "b", "c"]
+    assert graph.materializer.get("c") == 11
+    assert graph.changes == [(None, 11)]
+
+
+def test_only_nodes_downstream_of_a_changed_source_recompute():
+    graph = Graph()
+    graph.update(s1=1, s2=1)
+    graph.values["a"] = 2
+    result = graph.update(s1=2, s2=1)
+    assert result["changed_sources"] == ["s1"]
+    assert result["recomputed"] == ["a", "c"]
+    assert graph.calls == {"a": 2, "b": 1, "c": 2}
+    assert graph.materializer.get("c") == 12
+    assert graph.changes[-1] == (11, 12)
+
+
+def test_unchanged_value_does_not_invalidate_dependents():
+    graph = Graph()
+    graph.update(s1=1, s2=1)
+    result = graph.update(s1=2, s2=1)  # new version, same value
+    assert result["recomputed"] == ["a"]
+    assert result["changed"] == []
+    assert graph.calls["c"] == 1
+
+
+def test_failed_node_keeps_its_value_and_is_retried():
+    graph = Graph()
+    graph.update(s1=1, s2=1)
+    graph.fail.add("b")
+    graph.values["b"] = 20
+    result = graph.update(s1=1, s2=2)
+    assert result["errors"] == {"b": "b failed"}
+    assert graph.materializer.get("b") == 10
+
+    # Same versions: the failed node is retried, and its new value propagates
+    graph.fail.clear()
+    result = graph.update(s1=1, s2=2)
+    assert result["recomputed"] == ["b", "c"]
+    assert graph.materializer.get("c") == 21
+
+
+def test_max_age_refuses_nodes_left_behind_by_a_failure():
+    graph = Graph()
+    graph.update(s1=1, s2=1)
+    time.sleep(0.05)
+    graph.fail.add("b")
+    graph.update(s1=1, s2=2)
+    assert graph.materializer.get("a", max_age=0.03) == 1
+    # The failed node and everything downstream of it were last current before the sleep
+    assert graph.materializer.get("b", max_age=0.03) is None
+    assert graph.materializer.get("c", max_age=0.03) is None
+    assert graph.materializer.get("c") == 11
+
+
+def test_unknown_inputs_and_sources_are_rejected():
+    graph = Graph()
+    with pytest.raises(ValueError):
+        graph.materializer.add("d", graph.node("a"), ("missing",))
+    with pytest.raises(ValueError):
+        graph.update(s3=1)
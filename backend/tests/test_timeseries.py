@@ -0,0 +1,140 @@
+"""
+SeriesStore tests: the first load fetches the full history, later refreshes
+fetch only from the last stored bar, and periods are served as slices.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.timeseries import OHLCV_COLUMNS, SeriesStore
+
+
+def bars(dates, close):
+    close = np.asarray(close, dtype=float)
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 100.0},
+        index=pd.DatetimeIndex(dates),
+        columns=OHLCV_COLUMNS,
+    )
+
+
+class Upstream:
+    """Fetcher over an in-memory frame that records every requested window."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = []
+        self.error = None
+
+    def __call__(self, start, end):
+        self.calls.append((start, end))
+        if self.error is not None:
+            raise self.error
+        index = self.frame.index
+        return self.frame[(index >= pd.Timestamp(start).normalize()) & (index < pd.Timestamp(end))]
+
+
+@pytest.fixture
+def today():
+    return pd.Timestamp(datetime.now()).normalize()
+
+
+def test_first_load_fetches_history_then_only_new_bars(today):
+    upstream = Upstream(bars(pd.date_range(end=today - timedelta(days=1), periods=40), np.arange(40.0)))
+    store = SeriesStore(history_days=30)
+    store.register("X", upstream, max_age=0)
+
+    async def main():
+        first = await store.get("X", 30)
+        start, end = upstream.calls[0]
+        assert (end - start).days == 31
+        assert first.index[0] >= today - timedelta(days=31)
+
+        # Upstream revises yesterday's bar and adds today's
+        upstream.frame = pd.concat([upstream.frame.iloc[:-1], bars([today - timedelta(days=1), today], [100.0, 101.0])])
+        second = await store.get("X", 30)
+        assert upstream.calls[1][0] == (today - timedelta(days=1)).to_pydatetime()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert second.index.is_unique
+    assert second.index[-1] == today
+    assert second["Close"].iloc[-2:].tolist() == [100.0, 101.0]
+    assert len(second) == len(first) + 1
+
+
+def test_version_changes_only_with_the_bars(today):
+    upstream = Upstream(bars(pd.date_range(end=today, periods=10), np.arange(10.0)))
+    store = SeriesStore(history_days=30)
+    store.register("X", upstream, max_age=0)
+
+    async def main():
+        assert store.version("X") is None
+        await store.refresh("X")
+        before = store.version("X")
+        await store.refresh("X")
+        assert store.version("X") == before
+        upstream.frame = bars(upstream.frame.index, np.append(np.arange(9.0), 42.0))
+        await store.refresh("X")
+        assert store.version("X") != before
+
+    asyncio.run(main())
+    assert store.last_date("X") == today
+
+
+def test_periods_are_slices_of_the_stored_history(today):
+    upstream = Upstream(bars(pd.date_range(end=today, periods=60), np.arange(60.0)))
+    store = SeriesStore(history_days=90)
+    store.register("X", upstream, max_age=300)
+
+    async def main():
+        return await store.get("X", 90), await store.get("X", 7)
+
+    full, week = asyncio.run(main())
+    assert len(upstream.calls) == 1  # fresh data is not fetched again
+    assert week.index[0] == today - timedelta(days=7)
+    assert week.equals(full[full.index >= today - timedelta(days=7)])
+
+
+def test_failed_refresh_serves_stored_bars(today):
+    upstream = Upstream(bars(pd.date_range(end=today, periods=5), np.arange(5.0)))
+    store = SeriesStore(history_days=30)
+    store.register("X", upstream, max_age=0)
+
+    async def main():
+        await store.get("X", 30)
+        upstream.error = RuntimeError("upstream down")
+        return await store.get("X", 30)
+
+    assert len(asyncio.run(main())) == 5
+
+
+def test_failed_first_load_raises(today):
+    upstream = Upstream(bars([], []))
+    upstream.error = RuntimeError("upstream down")
+    store = SeriesStore(history_days=30)
+    store.register("X", upstream)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(store.get("X", 30))
+
+
+def test_concurrent_reads_share_one_refresh(today):
+    calls = []
+
+    async def fetch(start, end):
+        calls.append(start)
+        await asyncio.sleep(0.05)
+        return bars(pd.date_range(end=today, periods=5), np.arange(5.0))
+
+    store = SeriesStore(history_days=30)
+    store.register("X", fetch, max_age=300)
+
+    async def main():
+        return await asyncio.gather(*(store.get("X", 30) for _ in range(4)))
+
+    assert all(len(frame) == 5 for frame in asyncio.run(main()))
+    assert len(calls) == 1
@@ -0,0 +1,113 @@
+"""
+WriteBehindBuffer tests: debounced coalescing writes, failed flushes that keep
+their items, and write-through mode that never stages a failed write.
+"""
+import threading
+import time
+
+import pytest
+
+from app.utils.write_buffer import WriteBehindBuffer
+
+
+class Writer:
+    """Records every write; raises while `error` is set."""
+
+    def __init__(self):
+        self.writes = []
+        self.error = None
+        self.written = threading.Event()
+
+    def __call__(self, group, items):
+        if self.error is not None:
+            raise self.error
+        self.writes.append((group, dict(items)))
+        self.written.set()
+
+
+def test_submits_are_coalesced_into_one_debounced_write():
+    writer = Writer()
+    buffer = WriteBehindBuffer(writer, delay=0.05, max_delay=1)
+    buffer.submit("u1", {"a": 1})
+    buffer.submit("u1", {"a": 2, "b": 1})
+    assert buffer.pending("u1") == {"a": 2, "b": 1}
+    assert writer.written.wait(1)
+    time.sleep(0.05)
+    assert writer.writes == [("u1", {"a": 2, "b": 1})]
+    assert buffer.is_idle("u1")
+    assert buffer.stats()["coalesced"] == 1
+
+
+def test_flush_writes_synchronously():
+    writer = Writer()
+    buffer = WriteBehindBuffer(writer, delay=10)
+    buffer.submit("u1", {"a": 1})
+    buffer.flush("u1")
+    assert writer.writes == [("u1", {"a": 1})]
+    buffer.flush("u1")  # nothing pending
+    assert len(writer.writes) == 1
+
+
+def test_failed_flush_keeps_items_without_overwriting_newer_ones():
+    writer = Writer()
+    buffer = WriteBehindBuffer(writer, delay=10)
+    buffer.submit("u1", {"a": 1, "b": 1})
+
+    def fail_after_newer_submit(group, items):
+        buffer.submit(group, {"a": 2})
+        raise RuntimeError("db down")
+
+    buffer._writer = fail_after_newer_submit
+    with pytest.raises(RuntimeError):
+        buffer.flush("u1")
+    assert buffer.pending("u1") == {"a": 2, "b": 1}
+    assert buffer.stats()["flush_errors"] == 1
+
+    buffer._writer = writer
+    buffer.flush("u1")
+    assert writer.writes == [("u1", {"a": 2, "b": 1})]
+    assert buffer.pending("u1") == {}
+
+
+def test_flush_all_logs_failures_and_keeps_items():
+    writer = Writer()
+    writer.error = RuntimeError("db down")
+    buffer = WriteBehindBuffer(writer, delay=10)
+    buffer.submit("u1", {"a": 1})
+    buffer.flush_all()
+    assert buffer.pending("u1") == {"a": 1}
+    buffer.discard("u1")
+
+
+def test_discard_drops_selected_keys():
+    buffer = WriteBehindBuffer(Writer(), delay=10)
+    buffer.submit("u1", {"a": 1, "b": 2})
+    buffer.discard("u1", ["a"])
+    assert buffer.pending("u1") == {"b": 2}
+    buffer.discard("u1", ["b"])
+    assert buffer.is_idle("u1")
+
+
+def test_write_through_writes_immediately():
+    writer = Writer()
+    buffer = WriteBehindBuffer(writer, delay=0)
+    buffer.submit("u1", {"a": 1})
+    assert writer.writes == [("u1", {"a": 1})]
+    assert buffer.is_idle("u1")
+
+
+def test_failed_write_through_is_raised_and_never_staged():
+    writer = Writer()
+    writer.error = RuntimeError("db down")
+    buffer = WriteBehindBuffer(writer, delay=0)
+    with pytest.raises(RuntimeError):
+        buffer.submit("u1", {"a": 1})
+    # The caller was told the save failed, so it must not reappear later
+    assert buffer.pending("u1") == {}
+    assert buffer.is_idle("u1")
+
+    writer.error = None
+    buffer.submit("u1", {"b": 2})
+    buffer.flush_all()
+    assert writer.writes == [("u1", {"b": 2})]
+    assert buffer.stats()["flush_errors"] == 1